@@ -9,13 +9,19 @@ from difflib import get_close_matches
 class FoodChatbot:
     """NLP-based chatbot that understands food ordering commands"""
 
-    def __init__(self, menu_items):
+    # Intents whose reply depends only on the menu, never on the message text
+    STATIC_INTENTS = {'greeting', 'help', 'show_menu', 'view_cart', 'clear_cart', 'place_order'}
+
+    def __init__(self, menu_items, recommender=None):
         """
         Initialize chatbot with menu items.
         menu_items: list of dicts with 'id', 'name', 'price', 'category' keys
+        recommender: optional CooccurrenceModel used to suggest add-ons
         """
         self.menu_items = menu_items
         self.menu_names = {item['name'].lower(): item for item in menu_items}
+        self.menu_by_id = {item['id']: item for item in menu_items}
+        self.recommender = recommender
         self.menu_keywords = self._build_keyword_index()
 
         # Intent patterns — order matters! Specific intents must come before broad ones like 'add'
@@ -47,6 +53,12 @@ class FoodChatbot:
             ]
         }
 
+        self._intent_regexes = {
+            intent: [re.compile(p) for p in patterns]
+            for intent, patterns in self.intent_patterns.items()
+        }
+        self._name_regexes = self._build_name_regexes()
+
         # Number words mapping
         self.number_words = {
             'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
@@ -67,13 +79,68 @@ class FoodChatbot:
                     index[word].append(item)
         return index
 
+    def _build_name_regexes(self):
+        """Compiled item-name patterns, longest name first"""
+        return [
+            (re.compile(re.escape(name), re.IGNORECASE), item)
+            for name, item in sorted(self.menu_names.items(), key=lambda x: -len(x[0]))
+        ]
+
+    def update_menu(self, changed_items):
+        """
+        Apply added, changed and removed items (is_available = 0 removes)
+        without rebuilding every index: only the changed names are recompiled.
+        Builds new containers and swaps them in, so concurrent readers never
+        see one mid-update.
+        """
+        by_id = dict(self.menu_by_id)
+        names = dict(self.menu_names)
+        keywords = dict(self.menu_keywords)
+        touched = set()
+
+        for item in changed_items:
+            old = by_id.pop(item['id'], None)
+            if old is not None:
+                old_name = old['name'].lower()
+                if names.get(old_name) is old:
+                    del names[old_name]
+                touched.add(old_name)
+                for word in old_name.split():
+                    if len(word) > 2 and word in keywords:
+                        remaining = [i for i in keywords[word] if i['id'] != old['id']]
+                        if remaining:
+                            keywords[word] = remaining
+                        else:
+                            del keywords[word]
+            if item.get('is_available', 1):
+                by_id[item['id']] = item
+                name = item['name'].lower()
+                names[name] = item
+                touched.add(name)
+                for word in name.split():
+                    if len(word) > 2:
+                        keywords[word] = keywords.get(word, []) + [item]
+
+        regexes = [(p, i) for p, i in self._name_regexes if i['name'].lower() not in touched]
+        regexes += [
+            (re.compile(re.escape(name), re.IGNORECASE), names[name])
+            for name in touched if name in names
+        ]
+        regexes.sort(key=lambda x: -len(x[1]['name']))
+
+        self.menu_items = list(by_id.values())
+        self.menu_by_id = by_id
+        self.menu_names = names
+        self.menu_keywords = keywords
+        self._name_regexes = regexes
+
     def detect_intent(self, message):
         """Detect the primary intent from user message"""
         msg = message.lower().strip()
 
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, msg):
+        for intent, regexes in self._intent_regexes.items():
+            for regex in regexes:
+                if regex.search(msg):
                     return intent
 
         # Default: if message contains food items, assume 'add'
@@ -153,8 +220,7 @@ class FoodChatbot:
 
         # Strategy 1: Try to match known menu items directly in the message
         remaining = msg
-        for name, item in sorted(self.menu_names.items(), key=lambda x: -len(x[0])):
-            pattern = re.compile(re.escape(name), re.IGNORECASE)
+        for pattern, item in self._name_regexes:
             match = pattern.search(remaining)
             if match:
                 # Get text before the match for quantity
@@ -207,18 +273,27 @@ class FoodChatbot:
 
         return suggestions[:5]
 
-    def process_message(self, message):
+    def get_recommendations(self, item_ids, k=3):
+        """Items frequently ordered together with item_ids"""
+        if not self.recommender:
+            return []
+        ids = self.recommender.complements(item_ids, k=k, allowed=self.menu_by_id)
+        return [self.menu_by_id[i] for i in ids]
+
+    def process_message(self, message, intent=None):
         """
         Main entry point: process a user message and return a response.
         Returns dict with: intent, response, items, action
+        intent: pass the result of detect_intent() if it is already known
         """
-        intent = self.detect_intent(message)
+        intent = intent or self.detect_intent(message)
         response = {
             'intent': intent,
             'message': '',
             'items': [],
             'action': None,
-            'suggestions': []
+            'suggestions': [],
+            'recommendations': []
         }
 
         if intent == 'greeting':
@@ -278,6 +353,16 @@ class FoodChatbot:
                 )
                 response['message'] = f"✅ Added to cart: {item_list}\n\nAnything else you'd like to add? Say \"place order\" when ready!"
                 response['action'] = 'add_to_cart'
+
+                recommended = self.get_recommendations([i['item']['id'] for i in items])
+                if recommended:
+                    response['recommendations'] = [
+                        {'id': r['id'], 'name': r['name'], 'price': r['price']}
+                        for r in recommended
+                    ]
+                    response['message'] += "\n🍟 Often ordered with it: " + ', '.join(
+                        f"{r['name']} (₹{r['price']})" for r in recommended
+                    )
             else:
                 suggestions = self.get_suggestions(message)
                 if suggestions:
@@ -0,0 +1,114 @@
+"""
+"Frequently ordered together" recommendations.
+Keeps a sparse item x item co-occurrence matrix built from order_items baskets
+and a precomputed, sorted complement list per item, so a lookup is a slice of
+that list rather than a query over the order history.
+"""
+import threading
+from collections import Counter, defaultdict
+
+
+class CooccurrenceModel:
+    """Sparse co-occurrence counts over menu_item_id pairs"""
+
+    def __init__(self, index_size=20):
+        # Keep more than any request asks for, so filtering out unavailable
+        # items still leaves enough candidates
+        self.index_size = index_size
+        self.pairs = defaultdict(Counter)   # item -> {other item: baskets containing both}
+        self.popularity = Counter()         # item -> baskets containing it
+        self.index = {}                     # item -> [other item, ...] best first
+        self.baskets = 0
+        self.watermarks = {}                # order shard -> highest order id folded in
+        self._lock = threading.Lock()
+        # Held from reading a watermark to advancing it, so two refreshes
+        # never fold the same baskets in twice
+        self._refresh_lock = threading.Lock()
+
+    def add_basket(self, item_ids):
+        """Fold one order's distinct items into the matrix"""
+        items = sorted(set(item_ids))
+        with self._lock:
+            self._add(items)
+            for item in items:
+                self._reindex(item)
+
+    def _add(self, items):
+        self.baskets += 1
+        for i, a in enumerate(items):
+            self.popularity[a] += 1
+            for b in items[i + 1:]:
+                self.pairs[a][b] += 1
+                self.pairs[b][a] += 1
+
+    def _reindex(self, item):
+        ranked = sorted(
+            self.pairs[item].items(),
+            key=lambda kv: (-kv[1], -self.popularity[kv[0]], kv[0])
+        )
+        self.index[item] = [other for other, _ in ranked[:self.index_size]]
+
+    def load_from_db(self, conn, shard=0, chunk_size=2000, blocking=True):
+        """
+        Stream one shard's order_items past its watermark, one basket at a time.
+        With blocking=False, returns None at once if another refresh is running
+        (it, or the next one, picks up the new orders).
+        """
+        if not self._refresh_lock.acquire(blocking):
+            return None
+        try:
+            cursor = conn.execute(
+                "SELECT order_id, menu_item_id FROM order_items "
+                "WHERE order_id > ? ORDER BY order_id",
+                (self.watermarks.get(shard, 0),)
+            )
+            touched = set()
+            current_order, basket = None, []
+            with self._lock:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for order_id, item_id in rows:
+                        if order_id != current_order:
+                            if basket:
+                                self._add(sorted(set(basket)))
+                                touched.update(basket)
+                            current_order, basket = order_id, []
+                        basket.append(item_id)
+                if basket:
+                    self._add(sorted(set(basket)))
+                    touched.update(basket)
+                if current_order is not None:
+                    self.watermarks[shard] = max(self.watermarks.get(shard, 0), current_order)
+                for item in touched:
+                    self._reindex(item)
+            return len(touched)
+        finally:
+            self._refresh_lock.release()
+
+    def complements(self, item_ids, k=3, allowed=None):
+        """
+        Top-k items most often ordered with item_ids, excluding item_ids.
+        allowed: optional container of ids that may be recommended.
+        """
+        exclude = set(item_ids)
+        if len(exclude) == 1:
+            (only,) = exclude
+            result = []
+            for other in self.index.get(only, ()):
+                if allowed is None or other in allowed:
+                    result.append(other)
+                    if len(result) == k:
+                        break
+            return result
+
+        # Several items in the basket: merge their short lists
+        scores = Counter()
+        for item in exclude:
+            row = self.pairs.get(item, {})
+            for other in self.index.get(item, ()):
+                if other not in exclude and (allowed is None or other in allowed):
+                    scores[other] += row[other]
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], -self.popularity[kv[0]], kv[0]))
+        return [other for other, _ in ranked[:k]]
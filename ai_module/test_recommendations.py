@@ -0,0 +1,59 @@
+"""
+CooccurrenceModel refreshes from order_items.
+Run with: python -m pytest ai_module
+"""
+import sqlite3
+import threading
+
+from ai_module.recommendations import CooccurrenceModel
+
+
+def make_orders_db(path, orders):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE order_items (order_id INTEGER, menu_item_id INTEGER)")
+    conn.executemany(
+        "INSERT INTO order_items (order_id, menu_item_id) VALUES (?, ?)",
+        [(order_id, item) for order_id in range(1, orders + 1) for item in (1, 7)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_concurrent_refreshes_fold_each_basket_once(tmp_path):
+    path = str(tmp_path / 'orders.db')
+    make_orders_db(path, 5000)
+    model = CooccurrenceModel()
+    start = threading.Barrier(4)
+
+    def refresh():
+        conn = sqlite3.connect(path)
+        start.wait()
+        model.load_from_db(conn, chunk_size=100)
+        conn.close()
+
+    threads = [threading.Thread(target=refresh) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert model.baskets == 5000
+    assert model.pairs[1][7] == 5000
+    assert model.watermarks[0] == 5000
+    assert model.complements([1]) == [7]
+
+
+def test_non_blocking_refresh_skips_while_another_runs(tmp_path):
+    path = str(tmp_path / 'orders.db')
+    make_orders_db(path, 10)
+    model = CooccurrenceModel()
+    conn = sqlite3.connect(path)
+
+    with model._refresh_lock:
+        assert model.load_from_db(conn, blocking=False) is None
+    assert model.baskets == 0
+
+    assert model.load_from_db(conn) == 2
+    assert model.load_from_db(conn) == 0     # nothing past the watermark
+    assert model.baskets == 10
+    conn.close()
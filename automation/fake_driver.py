@@ -0,0 +1,144 @@
+"""
+In-memory stand-in for a Selenium WebDriver.
+Models the FoodieHub pages the order automation touches (menu, checkout,
+confirmation) with configurable page-load and render latency, so the wait,
+timing and pool scheduling logic can be exercised without Chrome.
+"""
+import time
+import threading
+from urllib.parse import urlparse
+
+try:
+    from selenium.common.exceptions import (
+        NoSuchElementException, StaleElementReferenceException
+    )
+except ImportError:  # keep the fake importable without selenium
+    class NoSuchElementException(Exception):
+        pass
+
+    class StaleElementReferenceException(Exception):
+        pass
+
+
+# Elements rendered on each route, keyed by data-testid
+PAGE_ELEMENTS = {
+    '/': [],
+    '/menu': ['add-to-cart-btn'] * 6,
+    '/checkout': ['checkout-name', 'checkout-phone', 'checkout-address', 'place-order-btn'],
+    '/order-confirmation': ['order-success'],
+}
+
+
+class FakeElement:
+    """Element that goes stale when its page is replaced or it is clicked away"""
+
+    def __init__(self, driver, testid, generation):
+        self.driver = driver
+        self.testid = testid
+        self.generation = generation
+        self.removed = False
+        self.value = ''
+
+    def _check(self):
+        if self.removed or self.generation != self.driver.generation:
+            raise StaleElementReferenceException(f"{self.testid} is no longer attached")
+
+    def is_displayed(self):
+        self._check()
+        return True
+
+    def is_enabled(self):
+        self._check()
+        return True
+
+    def clear(self):
+        self._check()
+        self.value = ''
+
+    def send_keys(self, *values):
+        self._check()
+        self.value += ''.join(values)
+
+    def click(self):
+        self._check()
+        self.driver.clicks.append(self.testid)
+        if self.testid == 'add-to-cart-btn':
+            # MenuCard swaps the ADD button for quantity controls
+            self.removed = True
+        elif self.testid == 'place-order-btn':
+            self.driver._navigate('/order-confirmation', self.driver.render_delay)
+
+
+class FakeDriver:
+    """Drop-in for webdriver.Chrome covering the calls OrderAutomation makes"""
+
+    _ids = 0
+    _ids_lock = threading.Lock()
+
+    def __init__(self, page_load_latency=0.05, render_delay=0.02, startup_latency=0.0):
+        with FakeDriver._ids_lock:
+            FakeDriver._ids += 1
+            self.session_id = f"fake-{FakeDriver._ids}"
+        time.sleep(startup_latency)
+        self.page_load_latency = page_load_latency
+        self.render_delay = render_delay
+        self.current_url = 'about:blank'
+        self.generation = 0
+        self.elements = []
+        self.rendered_at = 0.0
+        self.visits = []
+        self.clicks = []
+        self.resets = 0
+        self.quit_called = False
+
+    def _navigate(self, path, render_delay):
+        self.generation += 1
+        parsed = urlparse(self.current_url)
+        base = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else ''
+        self.current_url = f"{base}{path}"
+        self.visits.append(path)
+        self.elements = [
+            FakeElement(self, testid, self.generation)
+            for testid in PAGE_ELEMENTS.get(path, [])
+        ]
+        self.rendered_at = time.monotonic() + render_delay
+
+    def get(self, url):
+        if self.quit_called:
+            raise RuntimeError("Session has been quit")
+        time.sleep(self.page_load_latency)
+        self.current_url = url
+        path = urlparse(url).path or '/'
+        self._navigate(path, self.render_delay)
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        if 'readyState' in script:
+            return 'complete'
+        if 'localStorage' in script:
+            self.resets += 1
+        return None
+
+    def delete_all_cookies(self):
+        pass
+
+    def _live(self, selector):
+        # React renders after the document finishes loading
+        if time.monotonic() < self.rendered_at:
+            return []
+        return [e for e in self.elements
+                if not e.removed and f'data-testid="{e.testid}"' in selector]
+
+    def find_elements(self, by=None, value=None):
+        return self._live(value)
+
+    def find_element(self, by=None, value=None):
+        found = self._live(value)
+        if not found:
+            raise NoSuchElementException(f"No element matches {value}")
+        return found[0]
+
+    def quit(self):
+        self.quit_called = True
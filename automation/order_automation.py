@@ -5,6 +5,10 @@ Simulates automatic order placement workflow after order confirmation.
 import time
 import os
 import sys
+import threading
+import argparse
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from selenium import webdriver
@@ -19,31 +23,100 @@ except ImportError:
     print("Warning: Selenium not installed. Run: pip install selenium")
 
 
+def create_chrome_driver(headless=False):
+    """Create a Chrome WebDriver, optionally headless"""
+    if not SELENIUM_AVAILABLE:
+        raise RuntimeError("Selenium is not installed. Run: pip install selenium")
+
+    options = Options()
+    options.add_argument('--disable-notifications')
+    if headless:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1366,900')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+    else:
+        options.add_argument('--start-maximized')
+
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"❌ Failed to initialize WebDriver: {e}")
+        print("Make sure Chrome and ChromeDriver are installed.")
+        raise
+    # Explicit waits only: an implicit wait would silently stretch every
+    # failed lookup inside a WebDriverWait poll.
+    driver.implicitly_wait(0)
+    return driver
+
+
 class OrderAutomation:
     """Automates the order placement workflow using Selenium"""
 
-    def __init__(self, base_url="http://localhost:3000"):
+    def __init__(self, base_url="http://localhost:3000", headless=False,
+                 driver=None, timeout=10, poll_frequency=0.1, verbose=True):
         self.base_url = base_url
-        self.driver = None
+        self.headless = headless
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.verbose = verbose
+        # Drivers handed in from a pool are owned by the pool, not by us
+        self._owns_driver = driver is None
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
 
     def setup_driver(self):
         """Initialize Chrome WebDriver"""
-        if not SELENIUM_AVAILABLE:
-            raise RuntimeError("Selenium is not installed. Run: pip install selenium")
-
-        options = Options()
-        options.add_argument('--start-maximized')
-        options.add_argument('--disable-notifications')
-        # options.add_argument('--headless')  # Uncomment for headless mode
-
+        self.driver = create_chrome_driver(headless=self.headless)
+        self._owns_driver = True
+        self.log("✅ Chrome WebDriver initialized successfully")
+
+    # ─── WAIT HELPERS ─────────────────────────────────────────
+
+    def wait(self, timeout=None):
+        return WebDriverWait(self.driver, timeout or self.timeout,
+                             poll_frequency=self.poll_frequency)
+
+    def wait_for_page_load(self, timeout=None):
+        """Block until the browser reports the document as fully loaded"""
+        self.wait(timeout).until(
+            lambda d: d.execute_script('return document.readyState') == 'complete'
+        )
+
+    def open_page(self, path, ready_selector=None, timeout=None):
+        """Navigate to a path and wait until it is loaded (and optionally until
+        an element that marks the page as rendered is present)"""
+        self.driver.get(f"{self.base_url}{path}")
+        self.wait_for_page_load(timeout)
+        if ready_selector:
+            return self.wait(timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector))
+            )
+        return None
+
+    def run_step(self, results, name, action):
+        """
+        Run one workflow step and record its status and wall-clock duration.
+        action returns the step status ('success', 'skipped', 'unknown'); any
+        exception it raises is propagated after the timing is recorded.
+        """
+        started = time.perf_counter()
+        step = {'step': name, 'status': 'failed'}
         try:
-            self.driver = webdriver.Chrome(options=options)
-            self.driver.implicitly_wait(10)
-            print("✅ Chrome WebDriver initialized successfully")
+            step['status'] = action()
         except Exception as e:
-            print(f"❌ Failed to initialize WebDriver: {e}")
-            print("Make sure Chrome and ChromeDriver are installed.")
+            step['error'] = str(e)
             raise
+        finally:
+            step['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            results['steps'].append(step)
+        return step['status']
+
+    # ─── WORKFLOW ─────────────────────────────────────────────
 
     def simulate_order_placement(self, order_data=None):
         """
@@ -54,6 +127,9 @@ class OrderAutomation:
         4. Fill checkout form
         5. Submit order
         6. Verify success
+
+        Every step waits on a page condition instead of a fixed sleep, and
+        records its wall-clock time in results['steps'][i]['duration_ms'].
         """
         if not self.driver:
             self.setup_driver()
@@ -61,54 +137,57 @@ class OrderAutomation:
         results = {
             'steps': [],
             'success': False,
-            'order_id': None
+            'order_id': None,
+            'duration_ms': None
         }
-
-        try:
-            # Step 1: Navigate to home page
-            print("\n📍 Step 1: Navigating to home page...")
-            self.driver.get(self.base_url)
-            time.sleep(2)
-            results['steps'].append({'step': 'Navigate to home', 'status': 'success'})
-            print("   ✅ Home page loaded")
-
-            # Step 2: Navigate to menu page
-            print("📍 Step 2: Going to menu page...")
-            self.driver.get(f"{self.base_url}/menu")
-            time.sleep(2)
-            results['steps'].append({'step': 'Open menu page', 'status': 'success'})
-            print("   ✅ Menu page loaded")
-
-            # Step 3: Add items to cart (click first few Add to Cart buttons)
-            print("📍 Step 3: Adding items to cart...")
+        started = time.perf_counter()
+
+        def navigate_home():
+            self.log("\n📍 Step 1: Navigating to home page...")
+            self.open_page('/')
+            self.log("   ✅ Home page loaded")
+            return 'success'
+
+        def open_menu():
+            self.log("📍 Step 2: Going to menu page...")
+            self.open_page('/menu')
+            self.log("   ✅ Menu page loaded")
+            return 'success'
+
+        def add_items():
+            # Click first few Add to Cart buttons
+            self.log("📍 Step 3: Adding items to cart...")
             try:
-                add_buttons = WebDriverWait(self.driver, 10).until(
+                add_buttons = self.wait().until(
                     EC.presence_of_all_elements_located(
                         (By.CSS_SELECTOR, '[data-testid="add-to-cart-btn"]')
                     )
                 )
-                # Add first 2 items
+                # Add first 2 items; the ADD button is swapped for quantity
+                # controls once the cart has the item, so wait for that
                 for i, btn in enumerate(add_buttons[:2]):
                     btn.click()
-                    time.sleep(0.5)
-                    print(f"   ✅ Added item {i + 1} to cart")
-
-                results['steps'].append({'step': 'Add items to cart', 'status': 'success'})
+                    self.wait(5).until(EC.staleness_of(btn))
+                    self.log(f"   ✅ Added item {i + 1} to cart")
+                return 'success'
             except Exception as e:
-                print(f"   ⚠️ Could not click add buttons: {e}")
-                results['steps'].append({'step': 'Add items to cart', 'status': 'skipped'})
-
-            # Step 4: Navigate to checkout
-            print("📍 Step 4: Going to checkout...")
-            self.driver.get(f"{self.base_url}/checkout")
-            time.sleep(2)
-            results['steps'].append({'step': 'Navigate to checkout', 'status': 'success'})
-            print("   ✅ Checkout page loaded")
-
-            # Step 5: Fill checkout form
-            print("📍 Step 5: Filling order form...")
+                self.log(f"   ⚠️ Could not click add buttons: {e}")
+                return 'skipped'
+
+        def open_checkout():
+            self.log("📍 Step 4: Going to checkout...")
+            self.open_page('/checkout')
+            self.log("   ✅ Checkout page loaded")
+            return 'success'
+
+        def fill_form():
+            self.log("📍 Step 5: Filling order form...")
             try:
-                name_field = self.driver.find_element(By.CSS_SELECTOR, '[data-testid="checkout-name"]')
+                name_field = self.wait().until(
+                    EC.visibility_of_element_located(
+                        (By.CSS_SELECTOR, '[data-testid="checkout-name"]')
+                    )
+                )
                 name_field.clear()
                 name_field.send_keys("Selenium Test User")
 
@@ -120,89 +199,259 @@ class OrderAutomation:
                 address_field.clear()
                 address_field.send_keys("123 Test Street, Automation City")
 
-                time.sleep(1)
-                results['steps'].append({'step': 'Fill order form', 'status': 'success'})
-                print("   ✅ Form filled successfully")
+                self.log("   ✅ Form filled successfully")
+                return 'success'
             except Exception as e:
-                print(f"   ⚠️  Could not fill form: {e}")
-                results['steps'].append({'step': 'Fill order form', 'status': 'skipped'})
+                self.log(f"   ⚠️  Could not fill form: {e}")
+                return 'skipped'
 
-            # Step 6: Submit order
-            print("📍 Step 6: Submitting order...")
+        def submit_order():
+            self.log("📍 Step 6: Submitting order...")
             try:
-                submit_btn = WebDriverWait(self.driver, 5).until(
+                submit_btn = self.wait(5).until(
                     EC.element_to_be_clickable(
                         (By.CSS_SELECTOR, '[data-testid="place-order-btn"]')
                     )
                 )
                 submit_btn.click()
-                time.sleep(3)
-                results['steps'].append({'step': 'Submit order', 'status': 'success'})
-                print("   ✅ Order submitted!")
+                self.log("   ✅ Order submitted!")
+                return 'success'
             except Exception as e:
-                print(f"   ⚠️ Could not submit: {e}")
-                results['steps'].append({'step': 'Submit order', 'status': 'skipped'})
+                self.log(f"   ⚠️ Could not submit: {e}")
+                return 'skipped'
 
-            # Step 7: Verify success
-            print("📍 Step 7: Verifying order success...")
+        def verify_success():
+            self.log("📍 Step 7: Verifying order success...")
             try:
-                WebDriverWait(self.driver, 10).until(
+                self.wait().until(
                     EC.presence_of_element_located(
                         (By.CSS_SELECTOR, '[data-testid="order-success"]')
                     )
                 )
                 results['success'] = True
-                results['steps'].append({'step': 'Verify success', 'status': 'success'})
-                print("   ✅ Order placed successfully!")
+                self.log("   ✅ Order placed successfully!")
+                return 'success'
             except Exception:
                 # Check URL for confirmation
                 if 'confirmation' in self.driver.current_url or 'success' in self.driver.current_url:
                     results['success'] = True
-                    results['steps'].append({'step': 'Verify success', 'status': 'success'})
-                    print("   ✅ Order confirmation page reached!")
-                else:
-                    results['steps'].append({'step': 'Verify success', 'status': 'unknown'})
-                    print("   ⚠️ Could not verify success page")
-
-            time.sleep(3)
+                    self.log("   ✅ Order confirmation page reached!")
+                    return 'success'
+                self.log("   ⚠️ Could not verify success page")
+                return 'unknown'
 
+        try:
+            self.run_step(results, 'Navigate to home', navigate_home)
+            self.run_step(results, 'Open menu page', open_menu)
+            self.run_step(results, 'Add items to cart', add_items)
+            self.run_step(results, 'Navigate to checkout', open_checkout)
+            self.run_step(results, 'Fill order form', fill_form)
+            self.run_step(results, 'Submit order', submit_order)
+            self.run_step(results, 'Verify success', verify_success)
         except Exception as e:
-            print(f"\n❌ Automation error: {e}")
-            results['steps'].append({'step': 'Error', 'status': 'failed', 'error': str(e)})
+            self.log(f"\n❌ Automation error: {e}")
 
+        results['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
         return results
 
     def close(self):
-        """Close the browser"""
-        if self.driver:
+        """Close the browser (only if this instance created it)"""
+        if self.driver and self._owns_driver:
             self.driver.quit()
-            print("🔒 Browser closed")
+            self.driver = None
+            self.log("🔒 Browser closed")
+
+
+class DriverPool:
+    """
+    Fixed-size pool of reusable WebDriver sessions.
+    Sessions are created lazily up to `size` and reset (cookies and storage
+    cleared) between runs instead of paying a browser start per run.
+    """
+
+    def __init__(self, size, driver_factory=None, headless=True):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.driver_factory = driver_factory or (lambda: create_chrome_driver(headless=headless))
+        self._idle = []         # LIFO: the most recently used session is warmest
+        self._all = []          # every session, None for one being started
+        # Guards both lists; notified whenever a session or a free slot appears
+        self._cond = threading.Condition()
+        self._closed = False
+        self.created = 0
+
+    def acquire(self, timeout=None):
+        """Get an idle session, starting a new one if the pool is not full"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if len(self._all) < self.size:
+                    # Reserve the slot before the (slow) browser start
+                    self._all.append(None)
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No driver session became free within {timeout}s")
+                self._cond.wait(remaining)
 
+        try:
+            driver = self.driver_factory()
+        except Exception:
+            with self._cond:
+                if None in self._all:
+                    self._all.remove(None)
+                self._cond.notify()
+            raise
+        with self._cond:
+            if not self._closed:
+                self._all[self._all.index(None)] = driver
+                self.created += 1
+                return driver
+        driver.quit()
+        raise RuntimeError("Driver pool is closed")
+
+    def release(self, driver):
+        """Return a session to the pool; broken sessions are discarded"""
+        if not self._closed and self._reset(driver):
+            with self._cond:
+                if not self._closed:
+                    self._idle.append(driver)
+                    self._cond.notify()
+                    return
+        self._discard(driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        d = self.acquire(timeout=timeout)
+        try:
+            yield d
+        finally:
+            self.release(d)
 
-def run_automation():
+    def _reset(self, driver):
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        with self._cond:
+            if driver in self._all:
+                self._all.remove(driver)
+            # The freed slot lets a waiter start a replacement session
+            self._cond.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Quit every session owned by the pool"""
+        with self._cond:
+            self._closed = True
+            drivers, self._all, self._idle = [d for d in self._all if d is not None], [], []
+            self._cond.notify_all()
+        for d in drivers:
+            try:
+                d.quit()
+            except Exception:
+                pass
+
+
+def run_parallel(runs, concurrency, base_url="http://localhost:3000",
+                 headless=True, driver_factory=None, timeout=10):
+    """
+    Execute `runs` order placements over a pool of `concurrency` reusable
+    sessions. Returns one result dict per run, in run order.
+    """
+    pool = DriverPool(concurrency, driver_factory=driver_factory, headless=headless)
+
+    def one_run(run_index):
+        with pool.driver() as driver:
+            automation = OrderAutomation(base_url, driver=driver,
+                                         timeout=timeout, verbose=False)
+            result = automation.simulate_order_placement()
+        result['run'] = run_index
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(one_run, range(runs)))
+    finally:
+        pool.close()
+
+
+def print_results(results):
+    for step in results['steps']:
+        icon = "✅" if step['status'] == 'success' else "⚠️"
+        print(f"   {icon} {step['step']}: {step['status']} ({step['duration_ms']} ms)")
+
+    print(f"\n   Overall: {'✅ SUCCESS' if results['success'] else '⚠️ PARTIAL'}"
+          f" in {results['duration_ms']} ms")
+
+
+def run_automation(runs=1, concurrency=1, headless=False, base_url="http://localhost:3000",
+                   driver_factory=None):
     """Run the full automation workflow"""
     print("=" * 60)
     print("🤖 SELENIUM ORDER AUTOMATION")
     print("=" * 60)
 
-    automation = OrderAutomation()
-
-    try:
-        results = automation.simulate_order_placement()
+    if runs == 1 and concurrency == 1 and driver_factory is None:
+        automation = OrderAutomation(base_url, headless=headless)
+        try:
+            results = automation.simulate_order_placement()
+        finally:
+            automation.close()
 
         print("\n" + "=" * 60)
         print("📊 AUTOMATION RESULTS")
         print("=" * 60)
-        for step in results['steps']:
-            icon = "✅" if step['status'] == 'success' else "⚠️"
-            print(f"   {icon} {step['step']}: {step['status']}")
-
-        print(f"\n   Overall: {'✅ SUCCESS' if results['success'] else '⚠️ PARTIAL'}")
+        print_results(results)
         print("=" * 60)
+        return [results]
 
-    finally:
-        automation.close()
+    started = time.perf_counter()
+    all_results = run_parallel(runs, concurrency, base_url=base_url,
+                               headless=headless, driver_factory=driver_factory)
+    elapsed = time.perf_counter() - started
+
+    print("\n" + "=" * 60)
+    print(f"📊 AUTOMATION RESULTS ({runs} runs, {concurrency} parallel)")
+    print("=" * 60)
+    for results in all_results:
+        print(f"\n   Run {results['run'] + 1}:")
+        print_results(results)
+    succeeded = sum(1 for r in all_results if r['success'])
+    print(f"\n   {succeeded}/{runs} succeeded, wall time {elapsed:.2f}s")
+    print("=" * 60)
+    return all_results
 
 
 if __name__ == '__main__':
-    run_automation()
+    parser = argparse.ArgumentParser(description='Selenium order automation')
+    parser.add_argument('--base-url', default='http://localhost:3000')
+    parser.add_argument('--runs', type=int, default=1, help='number of order placements')
+    parser.add_argument('--parallel', type=int, default=1, help='number of concurrent browser sessions')
+    parser.add_argument('--headless', action='store_true', help='run Chrome without a window')
+    parser.add_argument('--fake', action='store_true',
+                        help='use the in-memory fake driver instead of Chrome')
+    args = parser.parse_args()
+
+    factory = None
+    if args.fake:
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from automation.fake_driver import FakeDriver
+        factory = FakeDriver
+
+    run_automation(runs=args.runs, concurrency=args.parallel, headless=args.headless,
+                   base_url=args.base_url, driver_factory=factory)
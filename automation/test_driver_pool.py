@@ -0,0 +1,78 @@
+"""
+DriverPool / run_parallel scheduling, exercised with the fake driver (no Chrome).
+Run with: python -m pytest automation
+"""
+import threading
+
+import pytest
+
+from automation.fake_driver import FakeDriver
+from automation.order_automation import DriverPool, run_parallel
+
+
+def fast_driver():
+    return FakeDriver(page_load_latency=0.001, render_delay=0.001)
+
+
+def test_run_parallel_reuses_pooled_sessions():
+    created = []
+
+    def factory():
+        created.append(fast_driver())
+        return created[-1]
+
+    results = run_parallel(runs=8, concurrency=3, driver_factory=factory, timeout=2)
+
+    assert [r['run'] for r in results] == list(range(8))
+    assert all(r['success'] for r in results)
+    assert 1 <= len(created) <= 3
+    assert all(d.quit_called for d in created)
+    # Sessions are reset between runs instead of being restarted
+    assert sum(d.resets for d in created) == 8
+
+
+def test_discarded_session_wakes_a_waiter():
+    pool = DriverPool(1, driver_factory=fast_driver)
+    broken = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+
+    def crash(script, *args):
+        raise RuntimeError("session crashed")
+
+    broken.execute_script = crash   # reset fails, so release() discards it
+    pool.release(broken)
+    waiter.join(5)
+
+    assert not waiter.is_alive()
+    assert got and got[0] is not broken
+    assert broken.quit_called
+    assert pool.created == 2
+    pool.close()
+
+
+def test_acquire_times_out_when_pool_is_busy():
+    pool = DriverPool(1, driver_factory=fast_driver)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    pool.close()
+
+
+def test_close_wakes_waiters():
+    pool = DriverPool(1, driver_factory=fast_driver)
+    pool.acquire()
+    errors = []
+
+    def wait():
+        try:
+            pool.acquire()
+        except RuntimeError as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    pool.close()
+    waiter.join(5)
+    assert not waiter.is_alive() and errors
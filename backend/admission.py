@@ -0,0 +1,276 @@
+"""
+Admission control for the expensive routes (order placement, chatbot).
+Each route class gets its own concurrency limit, an optional token bucket and
+a bounded wait queue, and all classes share one in-flight capacity per
+process. Freed slots go to the highest-priority waiter first, so under a
+spike chat requests queue (and are shed) before orders do. A request that
+cannot get in is rejected early with 503 + Retry-After instead of tying up a
+worker thread.
+"""
+import os
+import sys
+import math
+import time
+import threading
+from functools import wraps
+
+from flask import jsonify
+
+
+class Rejected(Exception):
+    """Request shed by admission control"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """`rate` tokens per second up to `burst`; callers may reserve future tokens"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_delay):
+        """
+        Take a token. Returns the seconds to wait before using it (0 if one is
+        available now), or raises Rejected if that would exceed max_delay.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            delay = max(0.0, (1 - self.tokens) / self.rate)
+            if delay > max_delay:
+                raise Rejected('rate_limited', math.ceil(delay))
+            self.tokens -= 1
+            return delay
+
+
+class RouteClass:
+    """Limits and counters for one class of routes"""
+
+    def __init__(self, name, priority, concurrency, queue, max_wait, rate=0, burst=0):
+        self.name = name
+        self.priority = priority            # lower runs first
+        self.concurrency = concurrency
+        self.max_queue = queue
+        self.max_wait = max_wait
+        self.bucket = TokenBucket(rate, burst or max(1, rate)) if rate > 0 else None
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = {'queue_full': 0, 'timeout': 0, 'rate_limited': 0}
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @classmethod
+    def from_env(cls, name, priority, concurrency, queue, max_wait, rate=0, burst=0):
+        """Defaults overridable with ADMISSION_<NAME>_{CONCURRENCY,QUEUE,WAIT,RATE,BURST}"""
+        prefix = f'ADMISSION_{name.upper()}_'
+        return cls(
+            name, priority,
+            concurrency=int(os.getenv(prefix + 'CONCURRENCY', concurrency)),
+            queue=int(os.getenv(prefix + 'QUEUE', queue)),
+            max_wait=float(os.getenv(prefix + 'WAIT', max_wait)),
+            rate=float(os.getenv(prefix + 'RATE', rate)),
+            burst=float(os.getenv(prefix + 'BURST', burst))
+        )
+
+    def stats(self):
+        return {
+            'priority': self.priority,
+            'concurrency': self.concurrency,
+            'in_flight': self.in_flight,
+            'queue_depth': self.queued,
+            'max_queue': self.max_queue,
+            'admitted': self.admitted,
+            'rejected': dict(self.rejected),
+            'avg_wait_ms': round(self.wait_total / self.admitted * 1000, 2) if self.admitted else 0.0,
+            'max_wait_ms': round(self.wait_max * 1000, 2)
+        }
+
+
+class _Waiter:
+    __slots__ = ('route_class', 'seq', 'granted')
+
+    def __init__(self, route_class, seq):
+        self.route_class = route_class
+        self.seq = seq
+        self.granted = False
+
+
+class AdmissionController:
+    """Per-process gate shared by every request thread"""
+
+    def __init__(self, capacity, classes, retry_after=1):
+        self.capacity = capacity
+        self.classes = {c.name: c for c in classes}
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._waiters = []
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def _can_run(self, route_class):
+        return self.in_flight < self.capacity and route_class.in_flight < route_class.concurrency
+
+    def _grant(self, waiter):
+        waiter.granted = True
+        waiter.route_class.in_flight += 1
+        self.in_flight += 1
+
+    def _dispatch(self):
+        """Hand free slots to waiters, best priority then arrival order"""
+        if not self._waiters or self.in_flight >= self.capacity:
+            return
+        self._waiters.sort(key=lambda w: (w.route_class.priority, w.seq))
+        for waiter in list(self._waiters):
+            if self.in_flight >= self.capacity:
+                break
+            if self._can_run(waiter.route_class):
+                self._waiters.remove(waiter)
+                waiter.route_class.queued -= 1
+                self._grant(waiter)
+        self._cond.notify_all()
+
+    def _reject(self, route_class, reason, retry_after=None):
+        route_class.rejected[reason] += 1
+        raise Rejected(reason, retry_after or self.retry_after)
+
+    def acquire(self, name):
+        """Block until the request may run; raises Rejected when shed"""
+        route_class = self.classes[name]
+        started = time.monotonic()
+        deadline = started + route_class.max_wait
+
+        if route_class.bucket is not None:
+            try:
+                delay = route_class.bucket.reserve(route_class.max_wait)
+            except Rejected as e:
+                with self._cond:
+                    self._reject(route_class, e.reason, e.retry_after)
+            if delay:
+                # A request sleeping for its token holds a thread too: it
+                # takes a queue place for the duration
+                with self._cond:
+                    if route_class.queued >= route_class.max_queue:
+                        self._reject(route_class, 'queue_full')
+                    route_class.queued += 1
+                try:
+                    time.sleep(delay)
+                finally:
+                    with self._cond:
+                        route_class.queued -= 1
+
+        with self._cond:
+            self._seq += 1
+            waiter = _Waiter(route_class, self._seq)
+            # Queue behind anyone already waiting with equal or better priority
+            ahead = any(w.route_class.priority <= route_class.priority for w in self._waiters)
+            if not ahead and self._can_run(route_class):
+                self._grant(waiter)
+            else:
+                if route_class.queued >= route_class.max_queue:
+                    self._reject(route_class, 'queue_full')
+                self._waiters.append(waiter)
+                route_class.queued += 1
+                self._dispatch()
+                while not waiter.granted:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._waiters.remove(waiter)
+                        route_class.queued -= 1
+                        self._reject(route_class, 'timeout')
+                    self._cond.wait(remaining)
+
+            waited = time.monotonic() - started
+            route_class.admitted += 1
+            route_class.wait_total += waited
+            route_class.wait_max = max(route_class.wait_max, waited)
+
+    def release(self, name):
+        with self._cond:
+            self.classes[name].in_flight -= 1
+            self.in_flight -= 1
+            self._dispatch()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'capacity': self.capacity,
+                'in_flight': self.in_flight,
+                'queue_depth': len(self._waiters),
+                'classes': {name: c.stats() for name, c in self.classes.items()}
+            }
+
+
+def server_threads():
+    """Request threads per process: GUNICORN_THREADS / ASGI_THREADS (the smaller if both set)"""
+    configured = [int(v) for v in (os.getenv('GUNICORN_THREADS'), os.getenv('ASGI_THREADS')) if v]
+    return min(configured) if configured else 32
+
+
+def build_controller():
+    """
+    Controller from the environment, or None when ADMISSION_CONTROL=false.
+    Running and queued requests both hold a server thread, so the defaults
+    keep every class's concurrency + queue within 3/4 of the threads: the rest
+    stays free for menu reads and status streams whatever the gated routes do.
+    Orders get two thirds of that budget, chat one third.
+    """
+    if os.getenv('ADMISSION_CONTROL', 'true').lower() != 'true':
+        return None
+    threads = server_threads()
+    budget = max(4, threads * 3 // 4)
+    orders_budget = budget * 2 // 3
+    chat_budget = budget - orders_budget
+    orders = RouteClass.from_env('orders', priority=0,
+                                 concurrency=max(1, orders_budget * 3 // 4),
+                                 queue=max(1, orders_budget - orders_budget * 3 // 4),
+                                 max_wait=10)
+    chatbot = RouteClass.from_env('chatbot', priority=1,
+                                  concurrency=max(1, chat_budget // 2),
+                                  queue=max(1, chat_budget - chat_budget // 2),
+                                  max_wait=2, rate=100, burst=200)
+    held = sum(c.concurrency + c.max_queue for c in (orders, chatbot))
+    if held >= threads:
+        print(f"⚠️  Admission limits let gated requests hold {held} of {threads} threads; "
+              "other routes can starve", file=sys.stderr)
+    return AdmissionController(
+        capacity=int(os.getenv('ADMISSION_CAPACITY', orders.concurrency + chatbot.concurrency)),
+        classes=[orders, chatbot],
+        retry_after=int(os.getenv('ADMISSION_RETRY_AFTER', '1'))
+    )
+
+
+def admit(controller, name):
+    """Route decorator: run the view only once admitted, else 503 + Retry-After"""
+    def decorator(view):
+        if controller is None:
+            return view
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                controller.acquire(name)
+            except Rejected as e:
+                response = jsonify({
+                    'success': False,
+                    'error': 'Server is busy, please retry shortly',
+                    'reason': e.reason
+                })
+                response.status_code = 503
+                response.headers['Retry-After'] = str(e.retry_after)
+                return response
+            try:
+                return view(*args, **kwargs)
+            finally:
+                controller.release(name)
+        return wrapper
+    return decorator
@@ -1,16 +1,33 @@
 """
 Flask REST API for Restaurant Ordering Application
+
+Importing this module only builds the app; it does not touch the database.
+Production servers use the create_app() factory with gunicorn --preload, so
+schema setup and cache warm-up happen once in the master before fork.
 """
 import sys
 import os
+import time
+import click
+import threading
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, redirect, send_file
 from flask_cors import CORS
-from database.db import get_db, init_db
+from database.db import get_db, get_order_db, order_shards, shard_of_order, init_db, submit_write
 from ai_module.chatbot import FoodChatbot
+from ai_module.recommendations import CooccurrenceModel
+from backend.order_status import (
+    OrderStatusTracker, TERMINAL_STATUSES, opening_events, accept_event
+)
+from backend.events import format_sse
+from backend.background import PeriodicTask
+from backend.admission import build_controller, admit
+from backend import responses, images
+from database import rollups, orders, export, menu_import
+from database.log_retention import archive_chatbot_logs
 from datetime import datetime
 
 app = Flask(__name__)
@@ -18,9 +35,84 @@ app = Flask(__name__)
 allowed_origins = os.getenv('CORS_ORIGINS', '*').split(',')
 CORS(app, resources={r"/api/*": {"origins": allowed_origins}})
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key')
+# orjson serialization and gzip/brotli compression of large bodies
+responses.init_app(app)
+
+# Encoded (and compressed) bodies of responses that only change with the menu version
+encoded_cache = responses.EncodedResponseCache()
+
+# Resized menu images on disk, filled by a bounded worker pool (IMAGE_* env vars)
+thumbnails = images.build_cache()
+
+# Global menu snapshot (available items, loaded once per process or in the master)
+menu_snapshot = None
+_menu_lock = threading.Lock()
+
+def _build_menu_snapshot(by_id, version):
+    items = list(by_id.values())
+    by_category = {}
+    for item in items:
+        by_category.setdefault(item['category'], []).append(item)
+    return {
+        'items': items,
+        'by_id': by_id,
+        'by_category': by_category,
+        'categories': ['All'] + list(by_category),
+        'version': version
+    }
+
+def get_menu_snapshot():
+    """Lazy-load available menu items and their categories"""
+    global menu_snapshot
+    if menu_snapshot is None:
+        conn = get_db()
+        # Version first: rows changed in between are simply applied again later
+        version = menu_import.current_menu_version(conn)
+        rows = conn.execute("SELECT * FROM menu_items WHERE is_available = 1").fetchall()
+        conn.close()
+        menu_snapshot = _build_menu_snapshot({r['id']: dict(r) for r in rows}, version)
+    return menu_snapshot
+
+
+def sync_menu():
+    """
+    Fold menu rows changed by imports (in any process) into the snapshot and
+    the chatbot indexes. A no-op unless menu_version moved.
+    """
+    global menu_snapshot
+    with _menu_lock:
+        snapshot = get_menu_snapshot()
+        conn = get_db()
+        try:
+            latest = menu_import.current_menu_version(conn)
+            if latest <= snapshot['version']:
+                return 0
+            changes = menu_import.menu_changes_since(conn, snapshot['version'])
+        finally:
+            conn.close()
+        if not changes:
+            return 0
+
+        by_id = dict(snapshot['by_id'])
+        for item in changes:
+            if item['is_available']:
+                by_id[item['id']] = item
+            else:
+                by_id.pop(item['id'], None)
+        # Chatbot first: replies cached under the new version must come from the new menu
+        if chatbot_instance is not None:
+            chatbot_instance.update_menu(changes)
+        menu_snapshot = _build_menu_snapshot(by_id, latest)
+        thumbnails.prefetch(item for item in changes if item['is_available'])
+        return len(changes)
+
+
+menu_sync = PeriodicTask(
+    'menu-sync',
+    float(os.getenv('MENU_SYNC_SECONDS', '5')),
+    sync_menu
+)
 
-# Initialize database on startup
-init_db()
 
 # Global chatbot instance (initialized with menu on first request)
 chatbot_instance = None
@@ -29,37 +121,103 @@ def get_chatbot():
     """Lazy-load chatbot with latest menu data"""
     global chatbot_instance
     if chatbot_instance is None:
-        conn = get_db()
-        rows = conn.execute("SELECT * FROM menu_items WHERE is_available = 1").fetchall()
-        menu = [dict(r) for r in rows]
-        conn.close()
-        chatbot_instance = FoodChatbot(menu)
+        menu = get_menu_snapshot()['items']
+        chatbot_instance = FoodChatbot(menu, recommender=get_recommender())
     return chatbot_instance
 
 
+# Global "ordered together" model (built from order_items on first use)
+recommender_instance = None
+
+def get_recommender():
+    """Lazy-load the co-occurrence model"""
+    global recommender_instance
+    if recommender_instance is None:
+        model = CooccurrenceModel()
+        for shard in order_shards():
+            conn = get_order_db(shard, attach_catalog=False)
+            model.load_from_db(conn, shard)
+            conn.close()
+        recommender_instance = model
+    return recommender_instance
+
+
+def refresh_recommender(shards=None, blocking=True):
+    """Fold in orders placed since the last refresh (by any process)"""
+    if recommender_instance is None:
+        return
+    for shard in order_shards() if shards is None else shards:
+        conn = get_order_db(shard, attach_catalog=False)
+        try:
+            recommender_instance.load_from_db(conn, shard, blocking=blocking)
+        finally:
+            conn.close()
+
+
+recommender_refresh = PeriodicTask(
+    'recommender-refresh',
+    float(os.getenv('RECOMMENDER_REFRESH_SECONDS', '30')),
+    refresh_recommender
+)
+
+
+# Order status scheduler + SSE fan-out (one per process)
+order_status_tracker = OrderStatusTracker(
+    interval=float(os.getenv('ORDER_STATUS_POLL_SECONDS', '1'))
+)
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+# Under gunicorn each open stream holds a worker thread, so streams are closed
+# after this long and EventSource reconnects (resuming with Last-Event-ID)
+SSE_MAX_STREAM_SECONDS = float(os.getenv('SSE_MAX_STREAM_SECONDS', '120'))
+_background_pid = None
+
+# chatbot_logs retention (off unless CHATBOT_LOG_RETENTION_DAYS is set)
+CHATBOT_LOG_RETENTION_DAYS = os.getenv('CHATBOT_LOG_RETENTION_DAYS')
+chatbot_log_archiver = PeriodicTask(
+    'chatbot-log-archiver',
+    float(os.getenv('CHATBOT_LOG_ARCHIVE_INTERVAL_SECONDS', '3600')),
+    lambda: archive_chatbot_logs(int(CHATBOT_LOG_RETENTION_DAYS))
+)
+
+# Per-process admission control for orders and chat (ADMISSION_* env vars)
+admission = build_controller()
+
+@app.before_request
+def ensure_background_tasks():
+    """Start background threads once per process (threads do not survive a fork)"""
+    global _background_pid
+    if _background_pid == os.getpid():
+        return
+    _background_pid = os.getpid()
+    if os.getenv('ORDER_STATUS_SCHEDULER', 'true').lower() == 'true':
+        order_status_tracker.start()
+    recommender_refresh.start()
+    menu_sync.start()
+    thumbnails.prefetch(get_menu_snapshot()['items'])
+    if CHATBOT_LOG_RETENTION_DAYS:
+        chatbot_log_archiver.start()
+
+
 # ─── MENU ENDPOINTS ───────────────────────────────────────────
 
 @app.route('/api/menu', methods=['GET'])
 def get_menu():
     """Get all available menu items, optionally filtered by category"""
     try:
-        conn = get_db()
-        category = request.args.get('category')
-
-        if category and category != 'All':
-            rows = conn.execute(
-                "SELECT * FROM menu_items WHERE is_available = 1 AND category = ?",
-                (category,)
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                "SELECT * FROM menu_items WHERE is_available = 1"
-            ).fetchall()
-
-        items = [dict(r) for r in rows]
-        conn.close()
-
-        return jsonify({'success': True, 'data': items})
+        snapshot = get_menu_snapshot()
+        category = request.args.get('category') or 'All'
+
+        def build():
+            if category != 'All':
+                items = snapshot['by_category'].get(category, [])
+            else:
+                items = snapshot['items']
+            if thumbnails.enabled:
+                items = images.with_thumbnails(items)
+            return {'success': True, 'data': items}
+
+        entry = encoded_cache.get(('menu', category), snapshot['version'], build)
+        return responses.cached_response(entry)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -68,14 +226,71 @@ def get_menu():
 def get_categories():
     """Get all unique menu categories"""
     try:
-        conn = get_db()
-        rows = conn.execute(
-            "SELECT DISTINCT category FROM menu_items WHERE is_available = 1"
-        ).fetchall()
-        categories = ['All'] + [r['category'] for r in rows]
-        conn.close()
+        snapshot = get_menu_snapshot()
+        entry = encoded_cache.get(('categories',), snapshot['version'],
+                                  lambda: {'success': True, 'data': snapshot['categories']})
+        return responses.cached_response(entry)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        return jsonify({'success': True, 'data': categories})
+
+@app.route('/api/menu/import', methods=['POST'])
+def import_menu():
+    """
+    Bulk upsert menu items from a CSV or NDJSON body (?format=csv|ndjson&dry_run=1).
+    Requires MENU_IMPORT_TOKEN to be set and sent as a Bearer token.
+    """
+    token = os.getenv('MENU_IMPORT_TOKEN')
+    if not token:
+        return jsonify({'success': False, 'error': 'Menu import is disabled (set MENU_IMPORT_TOKEN)'}), 403
+    if request.headers.get('Authorization') != f'Bearer {token}':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    fmt = request.args.get('format')
+    if not fmt:
+        content_type = request.content_type or ''
+        fmt = 'csv' if 'csv' in content_type else 'ndjson' if 'json' in content_type else None
+    if fmt not in menu_import.FORMATS:
+        return jsonify({'success': False, 'error': 'Send text/csv or application/x-ndjson, or pass ?format='}), 400
+
+    try:
+        dry_run = request.args.get('dry_run', 'false').lower() in ('1', 'true', 'yes')
+        summary = menu_import.import_menu(menu_import.iter_records(request.stream, fmt), dry_run=dry_run)
+        if summary['menu_version'] is not None:
+            sync_menu()
+        return jsonify({'success': True, 'data': summary})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/images/<int:item_id>/<int:width>', methods=['GET'])
+def get_menu_image(item_id, width):
+    """
+    Menu image resized to one of IMAGE_WIDTHS, as WebP or JPEG (from Accept,
+    or ?format=webp|jpeg). Falls back to a redirect to the original image.
+    """
+    try:
+        item = get_menu_snapshot()['by_id'].get(item_id)
+        if not item or not item.get('image_url') or width not in images.WIDTHS:
+            return jsonify({'success': False, 'error': 'Image not found'}), 404
+        source_url = item['image_url']
+
+        path = None
+        if thumbnails.enabled:
+            fmt = images.negotiate_format(request.headers.get('Accept'), request.args.get('format'))
+            path = thumbnails.get(source_url, width, fmt)
+        if path is None:
+            if source_url.startswith(('http://', 'https://')):
+                return redirect(source_url)
+            return jsonify({'success': False, 'error': 'Image unavailable'}), 502
+
+        response = send_file(path, mimetype=images.FORMATS[fmt], etag=thumbnails.etag(path),
+                             conditional=True, max_age=31536000)
+        # URLs carry ?v=<item version>, so a variant never changes under its URL
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.vary.add('Accept')
+        return response
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -143,6 +358,7 @@ def remove_from_cart():
 # ─── ORDER ENDPOINTS ──────────────────────────────────────────
 
 @app.route('/api/orders', methods=['POST'])
+@admit(admission, 'orders')
 def create_order():
     """Confirm and place an order"""
     try:
@@ -154,42 +370,15 @@ def create_order():
         if not items:
             return jsonify({'success': False, 'error': 'Cart is empty'}), 400
 
-        conn = get_db()
-        total = 0
-
-        # Validate all items and calculate total
-        validated_items = []
-        for cart_item in items:
-            item = conn.execute(
-                "SELECT * FROM menu_items WHERE id = ?",
-                (cart_item['id'],)
-            ).fetchone()
-            if item:
-                subtotal = item['price'] * cart_item['quantity']
-                total += subtotal
-                validated_items.append({
-                    'menu_item_id': item['id'],
-                    'quantity': cart_item['quantity'],
-                    'item_price': item['price'],
-                    'name': item['name']
-                })
-
-        # Create order
-        cursor = conn.execute(
-            "INSERT INTO orders (user_id, total_amount, status, order_type, delivery_address) VALUES (?, ?, ?, ?, ?)",
-            (1, total, 'confirmed', order_type, delivery_address)
+        order_id, total, validated_items = orders.place_order(
+            items, order_type, delivery_address, shard_key=data.get('outlet_id')
         )
-        order_id = cursor.lastrowid
 
-        # Create order items
-        for vi in validated_items:
-            conn.execute(
-                "INSERT INTO order_items (order_id, menu_item_id, quantity, item_price) VALUES (?, ?, ?, ?)",
-                (order_id, vi['menu_item_id'], vi['quantity'], vi['item_price'])
-            )
-
-        conn.commit()
-        conn.close()
+        try:
+            # Just this order's shard, and never wait behind a running refresh
+            refresh_recommender([shard_of_order(order_id)], blocking=False)
+        except Exception:
+            pass  # The periodic refresh picks it up later
 
         return jsonify({
             'success': True,
@@ -210,27 +399,90 @@ def create_order():
 def get_recent_orders():
     """Get last 3 orders with their items"""
     try:
-        conn = get_db()
-        orders = conn.execute(
-            "SELECT * FROM orders ORDER BY created_at DESC LIMIT 3"
-        ).fetchall()
-
-        result = []
-        for order in orders:
-            order_dict = dict(order)
-            # Get order items with menu item details
-            items = conn.execute('''
-                SELECT oi.*, mi.name, mi.image_url, mi.is_veg
-                FROM order_items oi
-                JOIN menu_items mi ON oi.menu_item_id = mi.id
-                WHERE oi.order_id = ?
-            ''', (order['id'],)).fetchall()
-            order_dict['items'] = [dict(i) for i in items]
-            result.append(order_dict)
+        result = orders.recent_orders(3)
+        return jsonify({'success': True, 'data': result})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        conn.close()
 
-        return jsonify({'success': True, 'data': result})
+@app.route('/api/orders/<int:order_id>/events', methods=['GET'])
+def order_status_events(order_id):
+    """Server-Sent Events stream of an order's status changes"""
+    # Subscribe before reading the current status so no change slips in between
+    subscription = order_status_tracker.subscribe(order_id)
+    try:
+        order = orders.load_order_status(order_id)
+    except Exception as e:
+        subscription.close()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+    if not order:
+        subscription.close()
+        return jsonify({'success': False, 'error': 'Order not found'}), 404
+
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            messages, status, seen = opening_events(
+                order_status_tracker, order_id, order['status'], last_event_id
+            )
+            for payload, event_id in messages:
+                yield format_sse(payload, event='status', event_id=event_id)
+
+            deadline = time.monotonic() + SSE_MAX_STREAM_SECONDS
+            while status not in TERMINAL_STATUSES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break   # free the thread; the client reconnects in 3s
+                event = subscription.get(timeout=min(SSE_HEARTBEAT_SECONDS, remaining))
+                if event is None:
+                    yield ': keep-alive\n\n'
+                    continue
+                deliver, status, seen = accept_event(event, status, seen)
+                if deliver:
+                    yield format_sse(event, event='status', event_id=event['id'])
+        finally:
+            subscription.close()
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+# ─── RECOMMENDATION ENDPOINT ──────────────────────────────────
+
+@app.route('/api/recommendations', methods=['GET'])
+def get_recommendations():
+    """Items frequently ordered together with ?items=1,7"""
+    try:
+        raw = request.args.get('items', '')
+        item_ids = [int(x) for x in raw.split(',') if x.strip()]
+        if not item_ids:
+            return jsonify({'success': False, 'error': 'items is required'}), 400
+        k = max(1, min(10, request.args.get('k', 3, type=int)))
+
+        bot = get_chatbot()
+        items = bot.get_recommendations(item_ids, k=k)
+
+        return jsonify({
+            'success': True,
+            'data': [
+                {
+                    'id': it['id'],
+                    'name': it['name'],
+                    'price': it['price'],
+                    'image_url': it['image_url'],
+                    'is_veg': it['is_veg']
+                }
+                for it in items
+            ]
+        })
+    except ValueError:
+        return jsonify({'success': False, 'error': 'items must be comma separated ids'}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -238,6 +490,7 @@ def get_recent_orders():
 # ─── CHATBOT ENDPOINT ─────────────────────────────────────────
 
 @app.route('/api/chatbot', methods=['POST'])
+@admit(admission, 'chatbot')
 def chatbot_message():
     """Process chatbot message and return AI response"""
     try:
@@ -248,25 +501,110 @@ def chatbot_message():
             return jsonify({'success': False, 'error': 'Message is required'}), 400
 
         bot = get_chatbot()
-        result = bot.process_message(message)
+        intent = bot.detect_intent(message)
+        entry = None
+        if intent in bot.STATIC_INTENTS:
+            # Same reply for every message with this intent, until the menu changes
+            entry = encoded_cache.get(('chatbot', intent), get_menu_snapshot()['version'],
+                                      lambda: {'success': True, 'data': bot.process_message(message, intent)})
+            result = entry.payload['data']
+        else:
+            result = bot.process_message(message, intent)
 
-        # Log the conversation
+        # Log the conversation (queued, not awaited, when a writer thread runs)
         try:
-            conn = get_db()
-            conn.execute(
+            submit_write(lambda conn: conn.execute(
                 "INSERT INTO chatbot_logs (user_id, user_message, bot_response, intent) VALUES (?, ?, ?, ?)",
                 (1, message, result['message'], result['intent'])
-            )
-            conn.commit()
-            conn.close()
+            ))
         except Exception:
             pass  # Don't fail the response if logging fails
 
+        if entry is not None:
+            return responses.cached_response(entry)
         return jsonify({'success': True, 'data': result})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+# ─── ANALYTICS ENDPOINTS ──────────────────────────────────────
+
+def _bounded_int_arg(name, default, low, high):
+    value = request.args.get(name, default, type=int)
+    return max(low, min(high, value))
+
+
+@app.route('/api/analytics/daily', methods=['GET'])
+def analytics_daily():
+    """Daily revenue by order type, read from the sales rollup"""
+    try:
+        days = _bounded_int_arg('days', 30, 1, 366)
+        data = rollups.daily_sales(days)
+        return jsonify({'success': True, 'data': data})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/analytics/top-items', methods=['GET'])
+def analytics_top_items():
+    """Best selling items over a recent window, read from the item rollup"""
+    try:
+        days = _bounded_int_arg('days', 7, 1, 366)
+        limit = _bounded_int_arg('limit', 5, 1, 50)
+        data = rollups.top_items(days, limit)
+        return jsonify({'success': True, 'data': data})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ─── EXPORT ENDPOINTS ─────────────────────────────────────────
+
+def _export_response(kind):
+    # Full dumps of addresses and chat messages: only with EXPORT_TOKEN as a Bearer token
+    token = os.getenv('EXPORT_TOKEN')
+    if not token:
+        return jsonify({'success': False, 'error': 'Exports are disabled (set EXPORT_TOKEN)'}), 403
+    if request.headers.get('Authorization') != f'Bearer {token}':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+
+    fmt = request.args.get('format', 'ndjson')
+    gzip = request.args.get('gzip', 'false').lower() in ('1', 'true', 'yes')
+    try:
+        cursor = export.export_cursor(kind)
+        chunks = export.export_stream(
+            kind, fmt,
+            since_id=request.args.get('since_id'),
+            until=cursor,
+            start_day=request.args.get('from'),
+            end_day=request.args.get('to'),
+            gzip=gzip
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return Response(
+        stream_with_context(chunks),
+        content_type=export.content_type(fmt, gzip),
+        headers={
+            'Content-Disposition': f'attachment; filename="{export.filename(kind, fmt, gzip)}"',
+            'Cache-Control': 'no-store',
+            # since_id for the next incremental export
+            'X-Export-Cursor': export.format_cursor(cursor)
+        }
+    )
+
+
+@app.route('/api/export/orders', methods=['GET'])
+def export_orders():
+    """Stream all orders with their items (?format=ndjson|csv&since_id=&from=&to=&gzip=1)"""
+    return _export_response('orders')
+
+
+@app.route('/api/export/chatbot-logs', methods=['GET'])
+def export_chatbot_logs():
+    """Stream chatbot_logs (?format=ndjson|csv&since_id=&from=&to=&gzip=1)"""
+    return _export_response('chatbot_logs')
+
+
 # ─── HEALTH CHECK ─────────────────────────────────────────────
 
 @app.route('/', methods=['GET'])
@@ -279,9 +617,17 @@ def root():
             'health': '/api/health',
             'menu': '/api/menu',
             'categories': '/api/menu/categories',
+            'menu_import': '/api/menu/import (POST)',
             'chatbot': '/api/chatbot (POST)',
             'orders': '/api/orders (POST)',
-            'recent_orders': '/api/orders/recent'
+            'recent_orders': '/api/orders/recent',
+            'order_events': '/api/orders/<id>/events (SSE)',
+            'analytics_daily': '/api/analytics/daily',
+            'analytics_top_items': '/api/analytics/top-items',
+            'recommendations': '/api/recommendations?items=<ids>',
+            'export_orders': '/api/export/orders',
+            'export_chatbot_logs': '/api/export/chatbot-logs',
+            'admission': '/api/admission'
         }
     })
 
@@ -289,8 +635,51 @@ def root():
 def health_check():
     return jsonify({'status': 'ok', 'message': 'Restaurant API is running!'})
 
+@app.route('/api/admission', methods=['GET'])
+def admission_stats():
+    """Queue depth, in-flight, rejections and wait times per route class (this process)"""
+    if admission is None:
+        return jsonify({'success': True, 'data': {'enabled': False}})
+    return jsonify({'success': True, 'data': {'enabled': True, **admission.stats()}})
+
+
+# ─── STARTUP ──────────────────────────────────────────────────
+
+def warm_caches():
+    """Build the menu snapshot, recommender and chatbot indexes up front"""
+    get_menu_snapshot()
+    bot = get_chatbot()
+    # Exercise every intent pattern and the fuzzy fallback once
+    bot.process_message('order 2 veg burgers and one coke')
+    bot.process_message('zzz')
+
+
+def create_app(init_database=None, warm=None):
+    """
+    App factory for preloaded servers (gunicorn --preload 'backend.app:create_app()').
+    Runs schema/seed setup once and warms caches in the master, so forked
+    workers share them copy-on-write and serve their first request hot.
+    """
+    if init_database is None:
+        init_database = os.getenv('INIT_DB_ON_STARTUP', 'true').lower() == 'true'
+    if warm is None:
+        warm = os.getenv('WARM_CACHES', 'true').lower() == 'true'
+    if init_database:
+        init_db(verbose=False)
+    if warm:
+        warm_caches()
+    return app
+
+
+@app.cli.command('init-db')
+@click.option('--quiet', is_flag=True, help='Do not print a confirmation')
+def init_db_command(quiet):
+    """Create tables and seed the menu (flask --app backend.app init-db)"""
+    init_db(verbose=not quiet)
+
 
 if __name__ == '__main__':
+    init_db()
     port = int(os.getenv('FLASK_PORT', 5000))
     debug = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
     print(f"🚀 Starting Restaurant API on port {port}")
@@ -0,0 +1,311 @@
+"""
+Async (ASGI) serving mode for the FoodieHub API.
+
+    uvicorn backend.asgi:app --host 0.0.0.0 --port 5000
+
+The existing Flask routes and JSON contracts are served unchanged: each
+request runs on a bounded thread pool, and SQLite writes go through the
+single dedicated writer thread (database.db.DBWriter). The event loop only
+moves bytes, so slow requests tie up a pool thread instead of a worker
+process. Order status streams (/api/orders/<id>/events) are served natively
+on the loop, so thousands of open SSE connections cost no threads at all.
+"""
+import io
+import os
+import re
+import sys
+import json
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db import start_writer, stop_writer
+from database.orders import load_order_status
+from backend.app import (
+    create_app, ensure_background_tasks, order_status_tracker,
+    allowed_origins, SSE_HEARTBEAT_SECONDS
+)
+from backend.events import format_sse
+from backend.order_status import TERMINAL_STATUSES, opening_events, accept_event
+
+ORDER_EVENTS_PATH = re.compile(r'^/api/orders/(\d+)/events$')
+
+
+class _RequestBody(io.RawIOBase):
+    """wsgi.input fed chunk by chunk from the ASGI receive channel"""
+
+    def __init__(self, loop, chunks):
+        self.loop = loop
+        self.chunks = chunks
+        self.buffer = bytearray()
+        self.eof = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self.buffer and not self.eof:
+            chunk = asyncio.run_coroutine_threadsafe(self.chunks.get(), self.loop).result()
+            if chunk:
+                self.buffer += chunk
+            else:
+                self.eof = True
+        n = min(len(b), len(self.buffer))
+        b[:n] = self.buffer[:n]
+        del self.buffer[:n]
+        return n
+
+
+def build_environ(scope, body):
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            key = 'CONTENT_TYPE'
+        elif name == 'CONTENT_LENGTH':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = f'HTTP_{name}'
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def request_header(scope, name):
+    name = name.lower().encode('latin-1')
+    for key, value in scope.get('headers', []):
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+
+class ASGIApp:
+    """Serves a Flask app over ASGI with thread-offloaded handlers"""
+
+    def __init__(self, flask_app, max_threads=None):
+        self.flask_app = flask_app
+        self.max_threads = max_threads or int(os.getenv('ASGI_THREADS', '32'))
+        self.executor = None
+        self._pid = None
+
+    def _ensure_started(self):
+        # Per process: uvicorn/gunicorn may import us before forking workers
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self.executor = ThreadPoolExecutor(self.max_threads, thread_name_prefix='asgi-handler')
+        start_writer()
+        ensure_background_tasks()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        self._ensure_started()
+
+        match = ORDER_EVENTS_PATH.match(scope['path'])
+        if match and scope['method'] == 'GET':
+            await self.order_events(int(match.group(1)), scope, receive, send)
+        else:
+            await self.call_wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._ensure_started()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                stop_writer()
+                if self.executor:
+                    self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    # ─── FLASK ROUTES ON THE THREAD POOL ──────────────────────
+
+    async def call_wsgi(self, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue(maxsize=8)
+        disconnected = threading.Event()
+
+        async def pump():
+            body_done = False
+            while True:
+                message = await receive()
+                if message['type'] == 'http.request' and not body_done:
+                    if message.get('body'):
+                        await chunks.put(message['body'])
+                    if not message.get('more_body', False):
+                        body_done = True
+                        await chunks.put(b'')
+                elif message['type'] == 'http.disconnect':
+                    disconnected.set()
+                    if not body_done:
+                        while not chunks.empty():
+                            chunks.get_nowait()
+                        chunks.put_nowait(b'')
+                    return
+
+        async def send_all(messages):
+            for message in messages:
+                await send(message)
+
+        def to_loop(*messages):
+            asyncio.run_coroutine_threadsafe(send_all(messages), loop).result()
+
+        def run():
+            started = {}
+
+            def start_response(status, headers, exc_info=None):
+                started['status'] = int(status.split(' ', 1)[0])
+                started['headers'] = [
+                    (k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers
+                ]
+                return None
+
+            environ = build_environ(scope, io.BufferedReader(_RequestBody(loop, chunks)))
+            result = self.flask_app(environ, start_response)
+            try:
+                # Hold one chunk back, so a single-chunk response (nearly all
+                # JSON routes) costs one hop to the loop; streamed responses
+                # are forwarded chunk by chunk
+                pending = []
+                for chunk in result:
+                    if disconnected.is_set():
+                        return
+                    if not chunk:
+                        continue
+                    if pending:
+                        if 'sent' not in started:
+                            started['sent'] = True
+                            pending.insert(0, {'type': 'http.response.start',
+                                               'status': started['status'],
+                                               'headers': started['headers']})
+                        to_loop(*pending)
+                    pending = [{'type': 'http.response.body', 'body': chunk, 'more_body': True}]
+
+                final = []
+                if 'sent' not in started:
+                    final.append({'type': 'http.response.start', 'status': started['status'],
+                                  'headers': started['headers']})
+                final.extend(pending)
+                final.append({'type': 'http.response.body', 'body': b''})
+                to_loop(*final)
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+
+        pump_task = asyncio.create_task(pump())
+        try:
+            await loop.run_in_executor(self.executor, run)
+        finally:
+            pump_task.cancel()
+
+    # ─── ORDER STATUS STREAM ON THE EVENT LOOP ────────────────
+
+    def _cors_headers(self, scope):
+        origin = request_header(scope, 'origin')
+        if '*' in allowed_origins:
+            return [(b'access-control-allow-origin', b'*')]
+        if origin and origin in allowed_origins:
+            return [(b'access-control-allow-origin', origin.encode('latin-1')),
+                    (b'vary', b'Origin')]
+        return []
+
+    async def send_json(self, send, status, payload, extra_headers=()):
+        body = json.dumps(payload).encode('utf-8')
+        await send({'type': 'http.response.start', 'status': status, 'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            *extra_headers
+        ]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def order_events(self, order_id, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        cors = self._cors_headers(scope)
+        # Subscribe before reading the current status so no change slips in between
+        subscription = order_status_tracker.subscribe_async(order_id, loop)
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    disconnected.set()
+                    return
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            try:
+                order = await loop.run_in_executor(self.executor, load_order_status, order_id)
+            except Exception as e:
+                await self.send_json(send, 500, {'success': False, 'error': str(e)}, cors)
+                return
+            if not order:
+                await self.send_json(send, 404, {'success': False, 'error': 'Order not found'}, cors)
+                return
+
+            last_event_id = request_header(scope, 'last-event-id')
+            last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+            messages, status, seen = await loop.run_in_executor(
+                self.executor, opening_events, order_status_tracker,
+                order_id, order['status'], last_event_id
+            )
+
+            await send({'type': 'http.response.start', 'status': 200, 'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+                *cors
+            ]})
+            opening = 'retry: 3000\n\n' + ''.join(
+                format_sse(payload, event='status', event_id=event_id)
+                for payload, event_id in messages
+            )
+            await send({'type': 'http.response.body', 'body': opening.encode('utf-8'), 'more_body': True})
+
+            while status not in TERMINAL_STATUSES and not disconnected.is_set():
+                event = await subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+                if disconnected.is_set():
+                    return
+                if event is None:
+                    chunk = ': keep-alive\n\n'
+                else:
+                    deliver, status, seen = accept_event(event, status, seen)
+                    if not deliver:
+                        continue
+                    chunk = format_sse(event, event='status', event_id=event['id'])
+                await send({'type': 'http.response.body', 'body': chunk.encode('utf-8'), 'more_body': True})
+
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            subscription.close()
+            watcher.cancel()
+
+
+app = ASGIApp(create_app())
@@ -0,0 +1,37 @@
+"""
+Periodic background jobs run on daemon threads inside each server process.
+"""
+import threading
+import traceback
+
+
+class PeriodicTask:
+    """Calls fn every `interval` seconds on a daemon thread until stopped"""
+
+    def __init__(self, name, interval, fn):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.fn()
+            except Exception:
+                # Keep the job alive; the next tick retries
+                traceback.print_exc()
+            self._stop.wait(self.interval)
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
@@ -0,0 +1,128 @@
+"""
+In-process publish/subscribe for pushing events to open connections.
+A subscriber is a bounded queue; publishing never blocks, a subscriber that
+stops draining simply loses its oldest events. Subscribers can be plain
+threads (Subscription) or asyncio tasks (AsyncSubscription).
+"""
+import asyncio
+import json
+import queue
+import threading
+from collections import defaultdict
+
+
+class Subscription:
+    """Queue of events for one topic, handed to a single consumer"""
+
+    def __init__(self, bus, topic, maxsize):
+        self.bus = bus
+        self.topic = topic
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def deliver(self, event):
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """Next event, or None if nothing arrived within timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class AsyncSubscription:
+    """Subscription drained by a coroutine on a given event loop"""
+
+    def __init__(self, bus, topic, maxsize, loop):
+        self.bus = bus
+        self.topic = topic
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def _put(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    def deliver(self, event):
+        # Called from the publisher's thread; hand over to the loop's thread
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # loop already closed
+
+    async def get(self, timeout=None):
+        """Next event, or None if nothing arrived within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """Topic-keyed fan-out to in-process subscribers"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic):
+        return self._add(Subscription(self, topic, self.maxsize))
+
+    def subscribe_async(self, topic, loop=None):
+        loop = loop or asyncio.get_running_loop()
+        return self._add(AsyncSubscription(self, topic, self.maxsize, loop))
+
+    def _add(self, sub):
+        with self._lock:
+            self._subscribers[sub.topic].add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.topic)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.topic]
+
+    def publish(self, topic, event):
+        """Deliver event to every subscriber of topic; returns how many"""
+        with self._lock:
+            subs = list(self._subscribers.get(topic, ()))
+        for sub in subs:
+            sub.deliver(event)
+        return len(subs)
+
+    def subscriber_count(self, topic=None):
+        with self._lock:
+            if topic is not None:
+                return len(self._subscribers.get(topic, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+
+def format_sse(data, event=None, event_id=None):
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    for line in json.dumps(data).splitlines():
+        lines.append(f"data: {line}")
+    return '\n'.join(lines) + '\n\n'
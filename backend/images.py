@@ -0,0 +1,293 @@
+"""
+Menu image thumbnails.
+Each menu image is resized to a few fixed widths, encoded as WebP or JPEG and
+kept in a disk cache with a size cap (least recently served files go
+first). A small thread pool fetches and resizes sources, both for the
+startup / menu-change prefetch and for requests that miss the cache, so at
+most IMAGE_WORKERS downloads run at once per process. Sources are http(s)
+URLs or files under IMAGE_SOURCE_DIR (plain relative paths or file:// URLs).
+
+Pillow is optional: without it, or with IMAGE_THUMBNAILS=false, the menu
+keeps its original image URLs and the endpoint redirects to them.
+"""
+import io
+import os
+import sys
+import time
+import hashlib
+import threading
+import urllib.request
+from urllib.parse import urlparse, unquote
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WIDTHS = tuple(int(w) for w in os.getenv('IMAGE_WIDTHS', '160,320,640').split(','))
+DEFAULT_WIDTH = 320 if 320 in WIDTHS else WIDTHS[len(WIDTHS) // 2]
+FORMATS = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+TOUCH_INTERVAL = 3600       # refresh a file's LRU position at most hourly
+FAILURE_TTL = float(os.getenv('IMAGE_FAILURE_TTL_SECONDS', '300'))   # don't refetch broken sources for this long
+
+# Origin thumbnail URLs are built on (Render sets RENDER_EXTERNAL_URL). Never
+# taken from the request: menu bodies are cached and shared between clients.
+# Unset, URLs are root-relative and the frontend resolves them against the API.
+PUBLIC_BASE_URL = (os.getenv('PUBLIC_BASE_URL') or os.getenv('RENDER_EXTERNAL_URL') or '').rstrip('/')
+
+
+def thumbnail_bytes(source, width, fmt):
+    """Resize image bytes to `width` (never upscaling) and encode them"""
+    image = Image.open(io.BytesIO(source))
+    image = ImageOps.exif_transpose(image)
+    if image.width > width:
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.LANCZOS)
+    out = io.BytesIO()
+    if fmt == 'webp':
+        image.save(out, 'WEBP', quality=80, method=4)
+    else:
+        image.convert('RGB').save(out, 'JPEG', quality=82, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+class ThumbnailCache:
+    """Disk cache of resized images plus the bounded worker pool that fills it"""
+
+    def __init__(self, cache_dir, source_dir, max_bytes, workers=4, fetch_timeout=10, enabled=True):
+        self.cache_dir = cache_dir
+        self.source_dir = os.path.realpath(source_dir)
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.fetch_timeout = fetch_timeout
+        self.enabled = enabled and Image is not None
+        self._pool = None
+        self._pid = None
+        self._pending = {}          # cache path -> Future
+        self._etags = {}            # cache path -> (size, etag)
+        self._failed = {}           # source url -> time.monotonic() until which it is not retried
+        self._size = None           # bytes on disk, scanned lazily
+        self._lock = threading.Lock()
+
+    # ─── paths and sources ───
+
+    def path_for(self, source_url, width, fmt):
+        key = hashlib.sha1(source_url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f'{key}_{width}.{fmt}')
+
+    def read_source(self, source_url):
+        """Bytes of a source image: http(s) URL, or a file inside source_dir"""
+        parsed = urlparse(source_url)
+        if parsed.scheme in ('http', 'https'):
+            request = urllib.request.Request(source_url, headers={'User-Agent': 'FoodieHub-thumbnailer'})
+            with urllib.request.urlopen(request, timeout=self.fetch_timeout) as response:
+                data = response.read(MAX_SOURCE_BYTES + 1)
+            if len(data) > MAX_SOURCE_BYTES:
+                raise ValueError(f"source image larger than {MAX_SOURCE_BYTES} bytes")
+            return data
+
+        # file://name.jpg (netloc) and file:///abs/path.jpg both work
+        path = unquote(parsed.netloc + parsed.path) if parsed.scheme == 'file' else source_url
+        path = os.path.realpath(os.path.join(self.source_dir, path))
+        if os.path.commonpath([path, self.source_dir]) != self.source_dir:
+            raise ValueError("local image sources must be inside IMAGE_SOURCE_DIR")
+        with open(path, 'rb') as f:
+            return f.read(MAX_SOURCE_BYTES)
+
+    # ─── rendering ───
+
+    def _executor(self):
+        # Per process: a pool created before a fork has no threads in the child
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='thumbnailer')
+            self._pending = {}
+        return self._pool
+
+    def _render(self, source_url, widths, fmts):
+        """Fetch a source once and write every missing variant of it"""
+        source = None
+        try:
+            for width in widths:
+                for fmt in fmts:
+                    path = self.path_for(source_url, width, fmt)
+                    if os.path.exists(path):
+                        continue
+                    if source is None:
+                        source = self.read_source(source_url)
+                    self._write(path, thumbnail_bytes(source, width, fmt))
+        except Exception:
+            # Recorded before the future resolves, so no waiter can resubmit in between
+            self._failed[source_url] = time.monotonic() + FAILURE_TTL
+            raise
+        self._failed.pop(source_url, None)
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._etags[path] = (len(data), hashlib.sha1(data).hexdigest()[:20])
+            if self._size is not None:
+                self._size += len(data)
+        if self._current_size() > self.max_bytes:
+            self.evict()
+
+    def submit(self, source_url, widths=WIDTHS, fmts=tuple(FORMATS)):
+        """Queue rendering of a source (deduplicated while in flight)"""
+        key = self.path_for(source_url, widths[0], fmts[0])
+        with self._lock:
+            pool = self._executor()
+            future = self._pending.get(key)
+            if future is None:
+                future = pool.submit(self._render, source_url, widths, fmts)
+                self._pending[key] = future
+                future.add_done_callback(lambda f, k=key: self._done(k, source_url, f))
+            return future
+
+    def _done(self, key, source_url, future):
+        with self._lock:
+            self._pending.pop(key, None)
+        error = future.exception()
+        if error is not None:
+            print(f"⚠️  Thumbnail failed for {source_url}: {error}", file=sys.stderr)
+
+    def failed_recently(self, source_url):
+        retry_at = self._failed.get(source_url)
+        return retry_at is not None and time.monotonic() < retry_at
+
+    def prefetch(self, items):
+        """Queue every width and format of each item's image; returns the count queued"""
+        if not self.enabled:
+            return 0
+        queued = 0
+        for item in items:
+            source_url = item.get('image_url')
+            if not source_url or self.failed_recently(source_url):
+                continue
+            if all(os.path.exists(self.path_for(source_url, w, f)) for w in WIDTHS for f in FORMATS):
+                continue
+            self.submit(source_url)
+            queued += 1
+        return queued
+
+    def get(self, source_url, width, fmt, timeout=5):
+        """
+        Path of a cached variant, rendering it (on the pool) if needed.
+        Returns None when it could not be produced within `timeout`, or at
+        once while the source is in its failure back-off.
+        """
+        path = self.path_for(source_url, width, fmt)
+        if not os.path.exists(path):
+            if self.failed_recently(source_url):
+                return None
+            future = self.submit(source_url, (width,), (fmt,))
+            try:
+                future.result(timeout)
+            except Exception:
+                return None     # timed out (still rendering) or the source failed
+        self._touch(path)
+        return path
+
+    def etag(self, path):
+        """Strong ETag: hash of the file's bytes (memoized per size)"""
+        size = os.path.getsize(path)
+        cached = self._etags.get(path)
+        if cached and cached[0] == size:
+            return cached[1]
+        with open(path, 'rb') as f:
+            etag = hashlib.sha1(f.read()).hexdigest()[:20]
+        self._etags[path] = (size, etag)
+        return etag
+
+    # ─── LRU size cap ───
+
+    def _touch(self, path):
+        try:
+            if time.time() - os.path.getmtime(path) > TOUCH_INTERVAL:
+                os.utime(path)
+        except OSError:
+            pass
+
+    def _scan(self):
+        files = []
+        for dirpath, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def _current_size(self):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            return self._size
+
+    def evict(self):
+        """Delete least recently served files until the cache is 90% of its cap"""
+        with self._lock:
+            files = sorted(self._scan())
+            total = sum(size for _, size, _ in files)
+            target = self.max_bytes * 0.9
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                    self._etags.pop(path, None)
+                except OSError:
+                    pass
+            self._size = total
+
+
+def negotiate_format(accept, requested=None):
+    """'webp' when asked for or accepted by the client, else 'jpeg'"""
+    if requested in FORMATS:
+        return requested
+    return 'webp' if 'image/webp' in (accept or '') else 'jpeg'
+
+
+def thumbnail_url(item, width=DEFAULT_WIDTH, base_url=None):
+    # The item version changes whenever an import rewrites the item,
+    # which is what lets these URLs be cached as immutable
+    base_url = PUBLIC_BASE_URL if base_url is None else base_url
+    return f"{base_url}/api/images/{item['id']}/{width}?v={item.get('version', 0)}"
+
+
+def with_thumbnails(items, base_url=None):
+    """Copies of menu items whose image_url points at the cached thumbnails"""
+    result = []
+    for item in items:
+        if not item.get('image_url'):
+            result.append(item)
+            continue
+        result.append({
+            **item,
+            'image_url': thumbnail_url(item, base_url=base_url),
+            'image_srcset': ', '.join(f"{thumbnail_url(item, w, base_url)} {w}w" for w in WIDTHS),
+            'original_image_url': item['image_url']
+        })
+    return result
+
+
+def build_cache():
+    return ThumbnailCache(
+        cache_dir=os.getenv('IMAGE_CACHE_DIR', os.path.join(ROOT, 'database', 'image_cache')),
+        source_dir=os.getenv('IMAGE_SOURCE_DIR', os.path.join(ROOT, 'database', 'images')),
+        max_bytes=int(os.getenv('IMAGE_CACHE_MAX_MB', '200')) * 1024 * 1024,
+        workers=int(os.getenv('IMAGE_WORKERS', '4')),
+        enabled=os.getenv('IMAGE_THUMBNAILS', 'true').lower() == 'true'
+    )
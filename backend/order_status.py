@@ -0,0 +1,185 @@
+"""
+Order status lifecycle: confirmed → preparing → out_for_delivery → delivered.
+A background tick advances orders by age and fans every recorded status change
+out to in-process subscribers, so open order pages never poll the database.
+"""
+import os
+
+from database.db import get_order_db, order_shards, shard_of_order
+from backend.background import PeriodicTask
+from backend.events import EventBus
+
+STATUS_FLOW = ['confirmed', 'preparing', 'out_for_delivery', 'delivered']
+TERMINAL_STATUSES = {'delivered', 'cancelled'}
+
+# Seconds after placement at which an order reaches each later status
+DEFAULT_TIMELINE = (60, 600, 1800)
+
+
+def load_timeline():
+    """Read ORDER_STATUS_TIMELINE ("60,600,1800") or fall back to the default"""
+    raw = os.getenv('ORDER_STATUS_TIMELINE')
+    if not raw:
+        return DEFAULT_TIMELINE
+    offsets = tuple(int(x) for x in raw.split(','))
+    if len(offsets) != len(STATUS_FLOW) - 1:
+        raise ValueError(f"ORDER_STATUS_TIMELINE needs {len(STATUS_FLOW) - 1} offsets")
+    return offsets
+
+
+def record_status(conn, order_id, status):
+    """Append a status change to the event log (caller commits)"""
+    conn.execute(
+        "INSERT INTO order_status_events (order_id, status) VALUES (?, ?)",
+        (order_id, status)
+    )
+
+
+def advance_order_statuses(conn, timeline=DEFAULT_TIMELINE, batch_size=500):
+    """
+    Move every order that is old enough to its next status. Orders that are
+    far behind jump straight to the status their age calls for.
+    Returns the number of orders changed.
+    """
+    due = []
+    # Latest stage first, so an order is claimed by the furthest status it qualifies for
+    for stage in range(len(STATUS_FLOW) - 1, 0, -1):
+        earlier = STATUS_FLOW[:stage]
+        placeholders = ','.join('?' * len(earlier))
+        rows = conn.execute(
+            f"SELECT id FROM orders WHERE status IN ({placeholders}) "
+            f"AND created_at <= datetime('now', ?) LIMIT ?",
+            (*earlier, f'-{timeline[stage - 1]} seconds', batch_size)
+        ).fetchall()
+        claimed = {order_id for order_id, _ in due}
+        due.extend((r['id'], stage) for r in rows if r['id'] not in claimed)
+
+    if not due:
+        # Nothing due: never take the write lock
+        return 0
+
+    changed = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for order_id, stage in due:
+            earlier = STATUS_FLOW[:stage]
+            placeholders = ','.join('?' * len(earlier))
+            # Conditional update: another process may already have advanced it
+            cursor = conn.execute(
+                f"UPDATE orders SET status = ? WHERE id = ? AND status IN ({placeholders})",
+                (STATUS_FLOW[stage], order_id, *earlier)
+            )
+            if cursor.rowcount:
+                record_status(conn, order_id, STATUS_FLOW[stage])
+                changed += 1
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return changed
+
+
+def fetch_status_events(conn, after_id, limit=1000):
+    rows = conn.execute(
+        "SELECT id, order_id, status, created_at FROM order_status_events "
+        "WHERE id > ? ORDER BY id LIMIT ?",
+        (after_id, limit)
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+class OrderStatusTracker:
+    """
+    Per-process scheduler + pub/sub for order status.
+    Each tick advances due orders, then reads the event log past this
+    process's watermark and publishes to subscribers of each order id.
+    That is one small query per tick per process and order shard,
+    regardless of how many order pages are open.
+    """
+
+    def __init__(self, interval=1.0, timeline=None):
+        self.bus = EventBus()
+        self.timeline = timeline or load_timeline()
+        self.watermarks = None              # order shard -> last event id published
+        self.task = PeriodicTask('order-status', interval, self.tick)
+
+    def start(self):
+        if self.watermarks is None:
+            watermarks = {}
+            for shard in order_shards():
+                conn = get_order_db(shard, attach_catalog=False)
+                watermarks[shard] = conn.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM order_status_events"
+                ).fetchone()[0]
+                conn.close()
+            self.watermarks = watermarks
+        self.task.start()
+
+    def stop(self):
+        self.task.stop()
+
+    def tick(self):
+        for shard in order_shards():
+            conn = get_order_db(shard, attach_catalog=False)
+            try:
+                advance_order_statuses(conn, self.timeline)
+                self.publish_pending(conn, shard)
+            finally:
+                conn.close()
+
+    def publish_pending(self, conn, shard=0):
+        if self.watermarks is None:
+            self.watermarks = {}
+        while True:
+            events = fetch_status_events(conn, self.watermarks.get(shard, 0))
+            if not events:
+                return
+            for event in events:
+                self.bus.publish(event['order_id'], event)
+            self.watermarks[shard] = events[-1]['id']
+
+    def subscribe(self, order_id):
+        return self.bus.subscribe(order_id)
+
+    def subscribe_async(self, order_id, loop=None):
+        return self.bus.subscribe_async(order_id, loop)
+
+    def history(self, order_id, after_event_id=0):
+        """Status changes recorded after a given event id (for SSE resume)"""
+        conn = get_order_db(shard_of_order(order_id), attach_catalog=False)
+        rows = conn.execute(
+            "SELECT id, order_id, status, created_at FROM order_status_events "
+            "WHERE order_id = ? AND id > ? ORDER BY id",
+            (order_id, after_event_id)
+        ).fetchall()
+        conn.close()
+        return [dict(r) for r in rows]
+
+
+def opening_events(tracker, order_id, current_status, last_event_id=None):
+    """
+    What a status stream sends when it (re)opens.
+    Returns (messages, status, seen_event_id) where messages is a list of
+    (payload, event_id) pairs: the current status for a fresh stream, or the
+    changes the client missed when it resumes with Last-Event-ID.
+    """
+    if last_event_id is None:
+        return [({'order_id': order_id, 'status': current_status}, None)], current_status, 0
+
+    missed = tracker.history(order_id, last_event_id)
+    if not missed:
+        return [], current_status, last_event_id
+    return [(e, e['id']) for e in missed], missed[-1]['status'], missed[-1]['id']
+
+
+def accept_event(event, status, seen_event_id):
+    """
+    Filter a published event for one stream.
+    Returns (deliver, status, seen_event_id) after dropping replays and a
+    repeat of the status the stream already reported.
+    """
+    if event['id'] <= seen_event_id:
+        return False, status, seen_event_id
+    if event['status'] == status:
+        return False, status, event['id']
+    return True, event['status'], event['id']
@@ -0,0 +1,191 @@
+"""
+Response encoding: fast JSON, negotiated compression, and a cache of
+already-encoded bodies.
+
+- JSON goes through orjson when it is installed (stdlib json otherwise).
+- Bodies above COMPRESS_MIN_BYTES are compressed with brotli (when the
+  `brotli` package is installed) or gzip, whichever the client accepts.
+- Responses that only change with a content version (menu, categories,
+  static chatbot replies) are serialized and compressed once per version
+  and then served as stored bytes, with an ETag for conditional requests.
+"""
+import os
+import gzip
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import request, current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+COMPRESSIBLE_TYPES = {'application/json', 'text/plain', 'text/html', 'text/csv', 'application/x-ndjson'}
+
+# Per-request bodies favour speed; cached bodies are compressed once, so harder
+GZIP_LEVEL, GZIP_LEVEL_CACHED = 5, 9
+BROTLI_QUALITY, BROTLI_QUALITY_CACHED = 4, 11
+
+
+def encode_json(obj):
+    """Compact JSON bytes with sorted keys (same document as jsonify)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=DefaultJSONProvider.default,
+                                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits: let the stdlib handle it
+    return json.dumps(obj, default=DefaultJSONProvider.default, ensure_ascii=False,
+                      sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """app.json provider that serializes with orjson when available"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return encode_json(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if self._app.debug:
+            # Keep the indented output in debug mode
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(encode_json(obj) + b'\n', mimetype=self.mimetype)
+
+
+def negotiate(accept_encoding):
+    """Best supported content coding the client accepts: 'br', 'gzip' or None"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.lower()] = q
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, cached=False):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY_CACHED if cached else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL_CACHED if cached else GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """after_request hook: compress large buffered bodies the client accepts"""
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate(request.headers.get('Accept-Encoding'))
+    if encoding:
+        response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+class _Encoded:
+    """One cached body: JSON bytes plus compressed variants made on first use"""
+
+    def __init__(self, version, payload, body):
+        self.version = version
+        self.payload = payload
+        self.body = body
+        # Content hash, so a validator never outlives the bytes it names
+        self.digest = hashlib.sha1(body).hexdigest()[:20]
+        self._variants = {}
+
+    def encoding_for(self, accepted):
+        """Coding actually used for a client accepting `accepted` (None: identity)"""
+        return accepted if len(self.body) >= COMPRESS_MIN_BYTES else None
+
+    def etag(self, encoding):
+        # Each coding is a different representation and gets its own strong ETag
+        return f"{self.digest}-{encoding}" if encoding else self.digest
+
+    def variant(self, encoding):
+        if encoding is None:
+            return self.body
+        data = self._variants.get(encoding)
+        if data is None:
+            data = self._variants[encoding] = compress(self.body, encoding, cached=True)
+        return data
+
+
+class EncodedResponseCache:
+    """Bounded LRU of encoded JSON bodies, each valid for one content version"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version, build):
+        """Entry for key at version; build() makes the payload on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                return entry
+        # Build outside the lock; two racing misses just do the work twice
+        payload = build()
+        entry = _Encoded(version, payload, encode_json(payload))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def cached_response(entry):
+    """Response for a cache entry: 304 on a matching ETag, else the stored bytes"""
+    response_class = current_app.response_class
+    conditional = request.method in ('GET', 'HEAD')
+    encoding = entry.encoding_for(negotiate(request.headers.get('Accept-Encoding')))
+    etag = entry.etag(encoding)
+    if conditional and etag in request.if_none_match:
+        response = response_class(status=304)
+    else:
+        response = response_class(entry.variant(encoding), mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    if conditional:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'   # revalidate, then 304
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(app):
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
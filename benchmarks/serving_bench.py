@@ -0,0 +1,213 @@
+"""
+Gunicorn vs async serving benchmark at high concurrency.
+Starts the API against a throwaway database in three modes -- plain gunicorn
+sync workers (a baseline, one request per process at a time), the shipped
+gunicorn config (gunicorn.conf.py: gthread, as in the Procfile) and the ASGI
+mode (uvicorn backend.asgi:app) -- and drives each with N keep-alive clients
+mixing menu reads, chatbot messages and order placement. Every mode runs
+once per --sse value: with no streams open, and with S order-status SSE
+streams held open for the whole run. Requests shed by admission control
+(503) are counted apart from errors.
+
+    python benchmarks/serving_bench.py --clients 200 --sse 0 100 --workers 2
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import signal
+import socket
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def http_request(reader, writer, method, path, body=None, host='127.0.0.1'):
+    payload = json.dumps(body).encode() if body is not None else b''
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n"
+    if body is not None:
+        head += f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+    writer.write(head.encode() + b"\r\n" + payload)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    length, chunked, keep_alive = 0, False, True
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+        elif name.lower() == 'transfer-encoding' and 'chunked' in value.lower():
+            chunked = True
+        elif name.lower() == 'connection' and 'close' in value.lower():
+            keep_alive = False
+    if chunked:
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def client(port, deadline, latencies, errors, shed, timeout):
+    reader = writer = None
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            roll = random.random()
+            if roll < 0.5:
+                req = ('GET', '/api/menu', None)
+            elif roll < 0.9:
+                req = ('POST', '/api/chatbot', {'message': 'order 2 veg burgers and a coke'})
+            else:
+                req = ('POST', '/api/orders', {'items': [{'id': 3, 'quantity': 1}, {'id': 7, 'quantity': 2}]})
+            started = time.monotonic()
+            status, keep_alive = await asyncio.wait_for(http_request(reader, writer, *req), timeout)
+            if status == 503:
+                shed.append(status)     # turned away by admission control
+            elif status >= 500:
+                errors.append(status)
+            else:
+                latencies.append(time.monotonic() - started)
+            if not keep_alive:
+                # Sync workers close after every response
+                writer.close()
+                reader = writer = None
+        except Exception:
+            errors.append('timeout/conn')
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def hold_sse(port, order_id, deadline, opened):
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"GET /api/orders/{order_id}/events HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), 10)
+        if b' 200 ' in line:
+            opened.append(1)
+        while time.monotonic() < deadline:
+            if not await asyncio.wait_for(reader.read(1024), deadline - time.monotonic()):
+                break
+    except Exception:
+        pass
+
+
+async def drive(port, clients, sse, duration, timeout):
+    # One order to watch, placed before the clock starts
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await http_request(reader, writer, 'POST', '/api/orders', {'items': [{'id': 1, 'quantity': 1}]})
+    writer.close()
+
+    deadline = time.monotonic() + duration
+    latencies, errors, shed, opened = [], [], [], []
+    tasks = [asyncio.create_task(hold_sse(port, 1, deadline, opened)) for _ in range(sse)]
+    await asyncio.sleep(0.5)
+    tasks += [asyncio.create_task(client(port, deadline, latencies, errors, shed, timeout))
+              for _ in range(clients)]
+    await asyncio.gather(*tasks)
+    return latencies, errors, shed, len(opened)
+
+
+def wait_for_port(port, timeout=20):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.2).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def run_mode(name, cmd, env, port, sse, args):
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        latencies, errors, shed, sse_open = asyncio.run(
+            drive(port, args.clients, sse, args.duration, args.timeout)
+        )
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    ok = len(latencies)
+    lat = sorted(latencies) or [0]
+    p99 = lat[min(len(lat) - 1, int(len(lat) * 0.99))]
+    print(f"{name:<10}{ok / args.duration:>10.1f}{statistics.median(lat) * 1000:>10.1f}"
+          f"{p99 * 1000:>10.1f}{len(shed):>10}{len(errors):>10}{sse_open:>8}/{sse}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--sse', type=int, nargs='+', default=[0, 100],
+                        help='order status streams held open; one pass per value')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--timeout', type=float, default=5, help='per-request timeout (s)')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='foodiehub-bench-')
+    try:
+        env = dict(os.environ, DB_PATH=os.path.join(tmp, 'restaurant.db'),
+                   PYTHONPATH=ROOT, FLASK_DEBUG='False',
+                   IMAGE_THUMBNAILS='false')   # no image prefetch competing with the load
+        subprocess.run([sys.executable, '-m', 'database.db'], cwd=ROOT, env=env,
+                       check=True, capture_output=True)
+
+        # Baseline: bypass gunicorn.conf.py to measure plain sync workers
+        empty_conf = os.path.join(tmp, 'gunicorn.conf.py')
+        open(empty_conf, 'w').close()
+        modes = [
+            ('sync', lambda port: [
+                sys.executable, '-m', 'gunicorn', 'backend.app:create_app()',
+                '-c', empty_conf, '--preload', '--worker-class', 'sync', '--workers', str(args.workers),
+                '--bind', f'127.0.0.1:{port}']),
+            # What the Procfile runs (gthread, GUNICORN_THREADS per worker)
+            ('gthread', lambda port: [
+                sys.executable, '-m', 'gunicorn', 'backend.app:create_app()',
+                '-c', os.path.join(ROOT, 'gunicorn.conf.py'), '--workers', str(args.workers),
+                '--bind', f'127.0.0.1:{port}']),
+            ('async', lambda port: [
+                sys.executable, '-m', 'uvicorn', 'backend.asgi:app',
+                '--workers', str(args.workers), '--port', str(port), '--log-level', 'warning']),
+        ]
+        print(f"{args.clients} clients, {args.workers} workers, {args.duration:.0f}s per run")
+        port = 5300
+        for sse in args.sse:
+            print(f"\n{sse} SSE streams open")
+            print(f"{'mode':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'503s':>10}{'errors':>10}{'sse':>12}")
+            for name, cmd in modes:
+                port += 1   # a fresh port per run, clear of the last server's sockets
+                run_mode(name, cmd(port), env, port, sse, args)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Order write throughput vs. number of order shards.
+For each shard count, initializes a throwaway database and runs P writer
+processes placing orders (database.orders.place_order, the same path as
+POST /api/orders) for a fixed time, each order keyed to a random outlet.
+
+    python benchmarks/shard_bench.py --shards 1 2 4 --procs 8 --duration 10
+"""
+import os
+import sys
+import time
+import shutil
+import random
+import argparse
+import tempfile
+import multiprocessing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def writer(env, duration, results):
+    # Configure before importing: the shard layout is read at import time
+    os.environ.update(env)
+    sys.path.insert(0, ROOT)
+    from database.orders import place_order
+
+    done = errors = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        items = [{'id': random.randint(1, 16), 'quantity': random.randint(1, 3)}
+                 for _ in range(random.randint(1, 4))]
+        try:
+            place_order(items, 'manual', '', shard_key=f'outlet-{random.randint(1, 500)}')
+            done += 1
+        except Exception:
+            errors += 1
+    results.put((done, errors))
+
+
+def run(shards, procs, duration):
+    tmp = tempfile.mkdtemp(prefix='foodiehub-shards-')
+    try:
+        env = {'DB_PATH': os.path.join(tmp, 'restaurant.db'), 'ORDER_SHARDS': str(shards),
+               'ORDER_SHARD_DIR': tmp}
+        ctx = multiprocessing.get_context('spawn')
+        init = ctx.Process(target=_init_db, args=(env,))
+        init.start()
+        init.join()
+
+        results = ctx.Queue()
+        workers = [ctx.Process(target=writer, args=(env, duration, results)) for _ in range(procs)]
+        for w in workers:
+            w.start()
+        totals = [results.get() for _ in workers]
+        for w in workers:
+            w.join()
+        done = sum(d for d, _ in totals)
+        errors = sum(e for _, e in totals)
+        return done / duration, errors
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _init_db(env):
+    os.environ.update(env)
+    sys.path.insert(0, ROOT)
+    from database.db import init_db
+    init_db(verbose=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--procs', type=int, default=8, help='writer processes')
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.procs} writer processes, {args.duration:.0f}s per run\n")
+    print(f"{'shards':<8}{'orders/s':>12}{'speedup':>10}{'errors':>10}")
+    baseline = None
+    for shards in args.shards:
+        rate, errors = run(shards, args.procs, args.duration)
+        baseline = baseline or rate
+        print(f"{shards:<8}{rate:>12.1f}{rate / baseline:>9.2f}x{errors:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Startup-time benchmark for the API.
+Each sample runs in a fresh interpreter against a throwaway database and
+reports: import time of backend.app, create_app() (schema + warm-up) time,
+and latency of the first and second /api/chatbot request, for a cold worker
+(lazy caches) and a preloaded one (caches built before the first request).
+
+    python benchmarks/startup_bench.py --repeat 5
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE = r'''
+import json, sys, time
+t0 = time.perf_counter()
+import backend.app as m
+t1 = time.perf_counter()
+if sys.argv[1] == 'preload':
+    m.create_app(init_database=False)
+t2 = time.perf_counter()
+client = m.app.test_client()
+client.post('/api/chatbot', json={'message': 'order 2 veg burgers and a coke'})
+t3 = time.perf_counter()
+client.post('/api/chatbot', json={'message': 'add one mango lassi'})
+t4 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'create_app_ms': (t2 - t1) * 1000,
+    'first_request_ms': (t3 - t2) * 1000,
+    'second_request_ms': (t4 - t3) * 1000,
+}))
+'''
+
+
+def run_sample(mode, env):
+    out = subprocess.run(
+        [sys.executable, '-c', SAMPLE, mode],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='foodiehub-bench-')
+    try:
+        env = dict(os.environ,
+                   DB_PATH=os.path.join(tmp, 'restaurant.db'),
+                   ORDER_STATUS_SCHEDULER='false',
+                   IMAGE_THUMBNAILS='false',   # no image prefetch competing with the timings
+                   PYTHONPATH=ROOT)
+        subprocess.run([sys.executable, '-m', 'database.db'], cwd=ROOT, env=env,
+                       check=True, capture_output=True)
+
+        print(f"{'mode':<10}{'import':>10}{'create_app':>12}{'1st req':>10}{'2nd req':>10}   (median ms, n={args.repeat})")
+        for mode in ('cold', 'preload'):
+            samples = [run_sample(mode, env) for _ in range(args.repeat)]
+            med = {k: statistics.median(s[k] for s in samples) for k in samples[0]}
+            print(f"{mode:<10}{med['import_ms']:>10.1f}{med['create_app_ms']:>12.1f}"
+                  f"{med['first_request_ms']:>10.1f}{med['second_request_ms']:>10.1f}")
+        print("\nWith --preload, create_app runs once in the gunicorn master, so every "
+              "worker starts at the 'preload' first-request latency.")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
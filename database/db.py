@@ -4,11 +4,27 @@ Switches to MySQL if configured in .env
 """
 import sqlite3
 import os
+import zlib
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
 from dotenv import load_dotenv
 
 load_dotenv()
 
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'restaurant.db')
+DB_PATH = os.getenv(
+    'DB_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'restaurant.db')
+)
+
+# Sharded order storage: with ORDER_SHARDS > 1, orders and everything keyed
+# by order (items, status events, sales rollups) live in N shard files, while
+# users, menu and chat logs stay in the catalog DB at DB_PATH.
+# An order id encodes its shard (id % ORDER_SHARDS), so the shard count must
+# not change once orders exist.
+ORDER_SHARDS = max(1, int(os.getenv('ORDER_SHARDS', '1')))
+SHARD_DIR = os.getenv('ORDER_SHARD_DIR', os.path.dirname(DB_PATH))
 
 def get_db():
     """Get SQLite connection"""
@@ -17,7 +33,298 @@ def get_db():
     conn.execute("PRAGMA foreign_keys = ON")
     return conn
 
-def init_db():
+def is_sharded():
+    return ORDER_SHARDS > 1
+
+def shard_path(shard):
+    return os.path.join(SHARD_DIR, f'orders_shard_{shard}.db')
+
+def order_shards():
+    """Shard numbers to scatter a read over"""
+    return range(ORDER_SHARDS)
+
+def shard_for_key(key):
+    """Stable shard for a user / outlet key"""
+    return zlib.crc32(str(key).encode('utf-8')) % ORDER_SHARDS
+
+def shard_of_order(order_id):
+    return int(order_id) % ORDER_SHARDS
+
+_next_shard = itertools.count()
+
+def choose_order_shard(key=None):
+    """
+    Shard a new order goes to: by hash of the user / outlet key when there is
+    one, else round-robin (guest checkouts all share user_id 1).
+    """
+    if not is_sharded():
+        return 0
+    if key is not None and key != '':
+        return shard_for_key(key)
+    return next(_next_shard) % ORDER_SHARDS
+
+def get_order_db(shard=0, attach_catalog=True):
+    """
+    Connection holding a shard's orders. Unsharded, that is the catalog DB.
+    Reads attach the catalog so joins against menu_items keep working; write
+    connections must not, as BEGIN IMMEDIATE would then also lock the catalog.
+    """
+    if not is_sharded():
+        return get_db()
+    conn = sqlite3.connect(shard_path(shard))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    if attach_catalog:
+        conn.execute("ATTACH DATABASE ? AS catalog", (DB_PATH,))
+    return conn
+
+class DBWriter:
+    """
+    Dedicated writer thread that owns one connection and runs every write
+    job submitted to it. Jobs queued together are group-committed in one
+    transaction, each inside its own savepoint so a failing job does not
+    take the others down. Jobs must not commit themselves.
+    """
+
+    def __init__(self, connect=None, max_batch=64):
+        self.connect = connect or get_db
+        self.max_batch = max_batch
+        self._jobs = queue.Queue()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        if self.running:
+            self._jobs.put(None)
+            self._thread.join(timeout)
+
+    def submit(self, fn):
+        """Queue fn(conn); returns a Future with its result"""
+        future = Future()
+        self._jobs.put((fn, future))
+        return future
+
+    def _run(self):
+        conn = self.connect()
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                batch = [job]
+                while len(batch) < self.max_batch:
+                    try:
+                        job = self._jobs.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        self._jobs.put(None)
+                        break
+                    batch.append(job)
+                self._run_batch(conn, batch)
+        finally:
+            conn.close()
+            # Nobody will run what is still queued: fail it instead of
+            # leaving run_write() callers waiting forever
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None:
+                    job[1].set_exception(RuntimeError("DB writer stopped"))
+
+    def _run_batch(self, conn, batch):
+        try:
+            results = self._execute_batch(conn, batch)
+        except Exception as e:
+            # The transaction itself failed (BEGIN, a savepoint or the commit):
+            # nothing in it was committed, so every job in the batch fails
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            results = [(future, None, e) for _, future in batch]
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _execute_batch(self, conn, batch):
+        """Run a batch in one transaction; returns (future, result, error) per job"""
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        for fn, future in batch:
+            conn.execute("SAVEPOINT job")
+            try:
+                result = fn(conn)
+            except Exception as e:
+                conn.execute("ROLLBACK TO job")
+                conn.execute("RELEASE job")
+                results.append((future, None, e))
+            else:
+                conn.execute("RELEASE job")
+                results.append((future, result, None))
+        conn.commit()
+        return results
+
+
+_writers = {}
+
+def _write_target(shard):
+    """Key of the DB a write goes to: None for the catalog, else the shard"""
+    return shard if shard is not None and is_sharded() else None
+
+def _connect_for(target):
+    if target is None:
+        return get_db()
+    return get_order_db(target, attach_catalog=False)
+
+def start_writer():
+    """Route run_write()/submit_write() through dedicated writer threads,
+    one per database file (async serving mode)"""
+    for target in [None] + ([*order_shards()] if is_sharded() else []):
+        writer = _writers.get(target)
+        if writer is None or not writer.running:
+            writer = DBWriter(connect=lambda t=target: _connect_for(t))
+            writer.start()
+            _writers[target] = writer
+    return _writers
+
+def stop_writer():
+    for writer in _writers.values():
+        writer.stop()
+    _writers.clear()
+
+def run_write(fn, shard=None):
+    """
+    Run fn(conn) as one write transaction and return its result.
+    shard=None writes to the catalog DB, otherwise to that order shard.
+    """
+    target = _write_target(shard)
+    writer = _writers.get(target)
+    if writer is not None and writer.running:
+        return writer.submit(fn).result()
+    conn = _connect_for(target)
+    try:
+        result = fn(conn)
+        conn.commit()
+        return result
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def lock_for_write(conn):
+    """
+    For run_write jobs that read before they write: take the write lock now,
+    so nothing can change between the reads and the writes. A job running on
+    a writer thread is already inside its BEGIN IMMEDIATE transaction.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+def submit_write(fn, shard=None):
+    """Like run_write, but does not wait when a writer thread is running"""
+    writer = _writers.get(_write_target(shard))
+    if writer is not None and writer.running:
+        writer.submit(fn)
+        return None
+    return run_write(fn, shard)
+
+# Order tables as they exist in each shard file. Same columns as in the
+# catalog schema, minus foreign keys to tables that live in the catalog.
+SHARD_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER DEFAULT 1,
+        total_amount REAL NOT NULL,
+        status TEXT DEFAULT 'confirmed',
+        order_type TEXT DEFAULT 'manual',
+        delivery_address TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        placed_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+    );
+
+    CREATE TABLE IF NOT EXISTS order_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id INTEGER NOT NULL,
+        menu_item_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL DEFAULT 1,
+        item_price REAL NOT NULL,
+        FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE
+    );
+
+    CREATE TABLE IF NOT EXISTS order_status_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE
+    );
+
+    CREATE TABLE IF NOT EXISTS app_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS sales_daily (
+        day TEXT NOT NULL,
+        order_type TEXT NOT NULL,
+        order_count INTEGER NOT NULL DEFAULT 0,
+        revenue REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, order_type)
+    );
+
+    CREATE TABLE IF NOT EXISTS item_sales_daily (
+        day TEXT NOT NULL,
+        menu_item_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL DEFAULT 0,
+        revenue REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, menu_item_id)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_orders_status_created ON orders(status, created_at);
+    CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items(order_id);
+    CREATE INDEX IF NOT EXISTS idx_order_status_events_order ON order_status_events(order_id, id);
+'''
+
+def ensure_placed_at(conn):
+    """Give an orders table created before placed_at the column and its index"""
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(orders)")}
+    if 'placed_at' not in columns:
+        # ALTER TABLE cannot add a column with a non-constant default, so
+        # inserts set it explicitly; old rows keep second resolution
+        conn.execute("ALTER TABLE orders ADD COLUMN placed_at TEXT")
+        conn.execute("UPDATE orders SET placed_at = strftime('%Y-%m-%d %H:%M:%f', created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_placed ON orders(placed_at, id)")
+
+def init_shard_dbs():
+    """Create the order tables in every shard file"""
+    os.makedirs(SHARD_DIR, exist_ok=True)
+    for shard in order_shards():
+        conn = get_order_db(shard, attach_catalog=False)
+        conn.executescript(SHARD_SCHEMA)
+        ensure_placed_at(conn)
+        conn.execute(
+            "INSERT OR IGNORE INTO app_state (key, value) "
+            "SELECT 'rollups_live_from_order_id', COALESCE(MAX(id), 0) FROM orders"
+        )
+        conn.commit()
+        conn.close()
+
+def init_db(verbose=True):
     """Initialize database with schema and seed data"""
     conn = get_db()
     cursor = conn.cursor()
@@ -42,7 +349,9 @@ def init_db():
             rating REAL DEFAULT 4.0,
             is_veg INTEGER DEFAULT 1,
             is_available INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            -- menu_version that last changed this row (see database.menu_import)
+            version INTEGER NOT NULL DEFAULT 0
         );
 
         CREATE TABLE IF NOT EXISTS orders (
@@ -53,6 +362,8 @@ def init_db():
             order_type TEXT DEFAULT 'manual',
             delivery_address TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            -- millisecond timestamp: orders on different shards are merged on it
+            placed_at TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
             FOREIGN KEY (user_id) REFERENCES users(id)
         );
 
@@ -75,8 +386,72 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users(id)
         );
+
+        -- Append-only log of order status changes; its id is the watermark
+        -- each process uses to fan changes out to SSE subscribers
+        CREATE TABLE IF NOT EXISTS order_status_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_orders_status_created ON orders(status, created_at);
+        CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items(order_id);
+        CREATE INDEX IF NOT EXISTS idx_order_status_events_order ON order_status_events(order_id, id);
+
+        -- Small key/value store for watermarks and versions
+        CREATE TABLE IF NOT EXISTS app_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+
+        -- Sales rollups, maintained inside the order transaction
+        CREATE TABLE IF NOT EXISTS sales_daily (
+            day TEXT NOT NULL,
+            order_type TEXT NOT NULL,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, order_type)
+        );
+
+        CREATE TABLE IF NOT EXISTS item_sales_daily (
+            day TEXT NOT NULL,
+            menu_item_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, menu_item_id)
+        );
+
+        -- Intent counts kept after chatbot_logs rows are archived
+        CREATE TABLE IF NOT EXISTS chatbot_intent_daily (
+            day TEXT NOT NULL,
+            intent TEXT NOT NULL,
+            message_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, intent)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_chatbot_logs_created ON chatbot_logs(created_at);
     ''')
 
+    # Databases created before menu versioning get the column in place
+    menu_columns = {row['name'] for row in cursor.execute("PRAGMA table_info(menu_items)")}
+    if 'version' not in menu_columns:
+        cursor.execute("ALTER TABLE menu_items ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+    ensure_placed_at(conn)
+    cursor.executescript('''
+        CREATE INDEX IF NOT EXISTS idx_menu_items_name ON menu_items(name COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_menu_items_version ON menu_items(version);
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO app_state (key, value) VALUES ('menu_version', '0')")
+
+    # Orders up to this id predate the rollups and are counted by the backfill
+    cursor.execute(
+        "INSERT OR IGNORE INTO app_state (key, value) "
+        "SELECT 'rollups_live_from_order_id', COALESCE(MAX(id), 0) FROM orders"
+    )
+
     # Check if data already seeded
     existing = cursor.execute("SELECT COUNT(*) FROM menu_items").fetchone()[0]
     if existing == 0:
@@ -115,7 +490,10 @@ def init_db():
 
     conn.commit()
     conn.close()
-    print("Database initialized successfully!")
+    if is_sharded():
+        init_shard_dbs()
+    if verbose:
+        print("Database initialized successfully!")
 
 if __name__ == '__main__':
     init_db()
@@ -0,0 +1,289 @@
+"""
+Streaming exports of orders (with their items) and chatbot_logs as NDJSON or
+CSV, optionally gzipped.
+Rows are read in id-ordered pages: each page is one short query drained with
+fetchmany before anything is yielded, so no read transaction stays open while
+a slow client downloads, and memory is bounded by the page size whatever the
+table size.
+
+Each export stops at the ids that existed when it started and reports them
+as a cursor (`export_cursor`). Pass that cursor back as since_id for the next
+incremental export. Order ids only increase within a shard, so the orders
+cursor has one id per shard ("0:412,1:398"); with a single shard a plain id
+works too.
+"""
+import io
+import csv
+import sys
+import json
+import zlib
+import heapq
+import argparse
+from datetime import datetime, timedelta
+
+from database.db import get_db, get_order_db, order_shards, is_sharded
+
+FORMATS = ('ndjson', 'csv')
+PAGE_SIZE = 500
+
+ORDER_COLUMNS = ['order_id', 'created_at', 'status', 'order_type', 'total_amount',
+                 'delivery_address', 'menu_item_id', 'item_name', 'quantity', 'item_price']
+CHATBOT_LOG_COLUMNS = ['id', 'user_id', 'user_message', 'bot_response', 'intent', 'created_at']
+
+
+def parse_day(value):
+    """'YYYY-MM-DD' or None -> same string, validated (ValueError otherwise)"""
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+
+
+def parse_cursor(kind, value):
+    """
+    since_id as given by a client -> {shard: last id} for orders, or an int for
+    chatbot_logs. ValueError when it cannot be used safely.
+    """
+    value = str(value or '').strip()
+    if kind != 'orders':
+        return int(value or 0)
+    if ':' not in value:
+        last_id = int(value or 0)
+        if last_id and is_sharded():
+            raise ValueError("order ids are per shard: pass the X-Export-Cursor "
+                             "of the previous export (e.g. 0:412,1:398) as since_id")
+        return {0: last_id} if last_id else {}
+    cursor = {}
+    shards = set(order_shards())
+    for part in value.split(','):
+        shard, _, last_id = part.partition(':')
+        if int(shard) not in shards:
+            raise ValueError(f"no order shard {shard}")
+        cursor[int(shard)] = int(last_id)
+    return cursor
+
+
+def export_cursor(kind):
+    """Highest ids right now: where an export started now stops"""
+    if kind != 'orders':
+        conn = get_db()
+        try:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM chatbot_logs").fetchone()[0]
+        finally:
+            conn.close()
+    cursor = {}
+    for shard in order_shards():
+        conn = get_order_db(shard, attach_catalog=False)
+        try:
+            cursor[shard] = conn.execute("SELECT COALESCE(MAX(id), 0) FROM orders").fetchone()[0]
+        finally:
+            conn.close()
+    return cursor
+
+
+def format_cursor(cursor):
+    if isinstance(cursor, dict):
+        return ','.join(f'{shard}:{last_id}' for shard, last_id in sorted(cursor.items()))
+    return str(cursor)
+
+
+def _range_clause(since_id, until_id, start_day, end_day):
+    """WHERE fragments for an id window (since_id, until_id] and an inclusive day range"""
+    clauses, params = ["id > ?"], [since_id or 0]
+    if until_id is not None:
+        clauses.append("id <= ?")
+        params.append(until_id)
+    if start_day:
+        clauses.append("created_at >= ?")
+        params.append(start_day)
+    if end_day:
+        next_day = (datetime.strptime(end_day, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        clauses.append("created_at < ?")
+        params.append(next_day)
+    return ' AND '.join(clauses), params
+
+
+def _pages(connect, sql, params, page_size):
+    """
+    Keyset pagination: yields lists of rows, re-running sql with the last id
+    seen. sql must select `id` first and end with "id > ? ... LIMIT ?".
+    """
+    last_id = params[0]
+    while True:
+        conn = connect()
+        try:
+            cursor = conn.execute(sql, [last_id, *params[1:], page_size])
+            rows = cursor.fetchmany(page_size)
+            cursor.close()
+        finally:
+            conn.close()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]['id']
+
+
+def _shard_orders(shard, since_id, until_id, start_day, end_day, page_size):
+    """One shard's orders with their items, in id order"""
+    where, params = _range_clause(since_id, until_id, start_day, end_day)
+    menu_table = 'catalog.menu_items' if is_sharded() else 'menu_items'
+    connect = lambda: get_order_db(shard)
+    sql = (
+        "SELECT id, created_at, status, order_type, total_amount, delivery_address "
+        f"FROM orders WHERE {where} ORDER BY id LIMIT ?"
+    )
+    for orders in _pages(connect, sql, params, page_size):
+        conn = connect()
+        try:
+            cursor = conn.execute(
+                "SELECT oi.order_id, oi.menu_item_id, mi.name, oi.quantity, oi.item_price "
+                f"FROM order_items oi LEFT JOIN {menu_table} mi ON mi.id = oi.menu_item_id "
+                f"WHERE oi.order_id IN ({','.join('?' * len(orders))}) ORDER BY oi.order_id, oi.id",
+                [o['id'] for o in orders]
+            )
+            items_by_order = {}
+            while True:
+                rows = cursor.fetchmany(page_size)
+                if not rows:
+                    break
+                for r in rows:
+                    items_by_order.setdefault(r['order_id'], []).append({
+                        'menu_item_id': r['menu_item_id'],
+                        'name': r['name'],
+                        'quantity': r['quantity'],
+                        'item_price': r['item_price']
+                    })
+        finally:
+            conn.close()
+        for order in orders:
+            order_dict = dict(order)
+            order_dict['items'] = items_by_order.get(order['id'], [])
+            yield order_dict
+
+
+def iter_orders(since=None, until=None, start_day=None, end_day=None, page_size=PAGE_SIZE):
+    """
+    Orders (dicts with an `items` list) in id order, across all shards.
+    since / until are {shard: id} cursors (missing shards: no bound).
+    """
+    since, until = since or {}, until or {}
+    return heapq.merge(
+        *(_shard_orders(shard, since.get(shard, 0), until.get(shard), start_day, end_day, page_size)
+          for shard in order_shards()),
+        key=lambda o: o['id']
+    )
+
+
+def iter_chatbot_logs(since_id=0, until_id=None, start_day=None, end_day=None, page_size=PAGE_SIZE):
+    """chatbot_logs rows (dicts) in id order"""
+    where, params = _range_clause(since_id, until_id, start_day, end_day)
+    sql = (
+        "SELECT id, user_id, user_message, bot_response, intent, created_at "
+        f"FROM chatbot_logs WHERE {where} ORDER BY id LIMIT ?"
+    )
+    for rows in _pages(get_db, sql, params, page_size):
+        for r in rows:
+            yield dict(r)
+
+
+def _order_csv_rows(order):
+    head = [order['id'], order['created_at'], order['status'], order['order_type'],
+            order['total_amount'], order['delivery_address']]
+    if not order['items']:
+        return [head + [None, None, None, None]]
+    return [head + [i['menu_item_id'], i['name'], i['quantity'], i['item_price']]
+            for i in order['items']]
+
+
+def _encode(records, fmt, columns, to_csv_rows, batch_size):
+    """Text chunks of about batch_size records each"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if fmt == 'csv':
+        writer.writerow(columns)
+    count = 0
+    for record in records:
+        if fmt == 'csv':
+            writer.writerows(to_csv_rows(record))
+        else:
+            buffer.write(json.dumps(record, ensure_ascii=False))
+            buffer.write('\n')
+        count += 1
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)   # wbits 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(kind, fmt='ndjson', since_id=None, until=None, start_day=None, end_day=None,
+                  gzip=False, page_size=PAGE_SIZE):
+    """
+    Bytes chunks of a full export; kind is 'orders' or 'chatbot_logs'.
+    since_id is a cursor as accepted by parse_cursor; until is the
+    export_cursor() taken when the export started.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    if kind not in ('orders', 'chatbot_logs'):
+        raise ValueError(f"unknown export: {kind}")
+    start_day, end_day = parse_day(start_day), parse_day(end_day)
+    since = parse_cursor(kind, since_id)
+    if kind == 'orders':
+        records = iter_orders(since, until, start_day, end_day, page_size)
+        text = _encode(records, fmt, ORDER_COLUMNS, _order_csv_rows, page_size)
+    else:
+        records = iter_chatbot_logs(since, until, start_day, end_day, page_size)
+        text = _encode(records, fmt, CHATBOT_LOG_COLUMNS,
+                       lambda r: [[r[c] for c in CHATBOT_LOG_COLUMNS]], page_size)
+
+    chunks = (t.encode('utf-8') for t in text)
+    return _gzip(chunks) if gzip else chunks
+
+
+def content_type(fmt, gzip=False):
+    if gzip:
+        return 'application/gzip'
+    return 'text/csv; charset=utf-8' if fmt == 'csv' else 'application/x-ndjson'
+
+
+def filename(kind, fmt, gzip=False):
+    return f"{kind}.{fmt}{'.gz' if gzip else ''}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stream orders or chatbot_logs as NDJSON/CSV')
+    parser.add_argument('kind', choices=['orders', 'chatbot_logs'])
+    parser.add_argument('--format', choices=FORMATS, default='ndjson')
+    parser.add_argument('--since-id', help='cursor printed by the previous export (orders: 0:412,1:398)')
+    parser.add_argument('--from', dest='start_day', help='YYYY-MM-DD (inclusive)')
+    parser.add_argument('--to', dest='end_day', help='YYYY-MM-DD (inclusive)')
+    parser.add_argument('--gzip', action='store_true')
+    parser.add_argument('-o', '--output', help='file to write (default: stdout)')
+    args = parser.parse_args()
+
+    cursor = export_cursor(args.kind)
+    try:
+        chunks = export_stream(args.kind, args.format, args.since_id, cursor,
+                               args.start_day, args.end_day, args.gzip)
+    except ValueError as e:
+        parser.error(str(e))
+    out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+    print(f"next --since-id {format_cursor(cursor)}", file=sys.stderr)
@@ -0,0 +1,214 @@
+"""
+chatbot_logs retention.
+Rows older than N days are appended to date-partitioned NDJSON.gz archives
+(archive/chatbot_logs/YYYY/MM/YYYY-MM-DD.ndjson.gz), folded into
+chatbot_intent_daily, and deleted in small batches so writers are only
+blocked for one short transaction at a time.
+"""
+import os
+import gzip
+import json
+import time
+import socket
+import argparse
+from collections import Counter, defaultdict
+
+from database.db import get_db
+
+ARCHIVE_DIR = os.getenv(
+    'CHATBOT_LOG_ARCHIVE_DIR',
+    os.path.join(os.path.dirname(__file__), 'archive')
+)
+LEASE_KEY = 'chatbot_log_archiver_lease'
+
+
+def archive_path(archive_dir, day):
+    year, month, _ = day.split('-')
+    return os.path.join(archive_dir, 'chatbot_logs', year, month, f'{day}.ndjson.gz')
+
+
+def _acquire_lease(conn, ttl):
+    """Let only one process archive at a time (other workers skip the run)"""
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT value FROM app_state WHERE key = ?", (LEASE_KEY,)).fetchone()
+        if row:
+            holder, expires = row['value'].rsplit('|', 1)
+            if holder != owner and float(expires) > now:
+                conn.rollback()
+                return None
+        conn.execute(
+            "INSERT INTO app_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (LEASE_KEY, f"{owner}|{now + ttl}")
+        )
+        conn.commit()
+        return owner
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _release_lease(conn, owner):
+    # Exact prefix match: hostnames may contain LIKE wildcards (_ and %)
+    holder = f"{owner}|"
+    conn.execute(
+        "DELETE FROM app_state WHERE key = ? AND substr(value, 1, ?) = ?",
+        (LEASE_KEY, len(holder), holder)
+    )
+    conn.commit()
+
+
+def _append_archive(archive_dir, rows_by_day):
+    """Append one gzip member per day file; durable before the rows are deleted"""
+    for day, rows in rows_by_day.items():
+        path = archive_path(archive_dir, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='ab') as gz:
+                for row in rows:
+                    gz.write(json.dumps(row, ensure_ascii=False).encode('utf-8'))
+                    gz.write(b'\n')
+            raw.flush()
+            os.fsync(raw.fileno())
+
+
+def archive_chatbot_logs(older_than_days=30, batch_size=500, pause=0.05,
+                         archive_dir=None, lease_ttl=600, verbose=False):
+    """
+    Move chatbot_logs rows older than `older_than_days` into the archive.
+    Returns the number of rows archived (0 if another process holds the lease).
+    """
+    archive_dir = archive_dir or ARCHIVE_DIR
+    conn = get_db()
+    owner = _acquire_lease(conn, lease_ttl)
+    if owner is None:
+        conn.close()
+        return 0
+
+    cutoff = conn.execute(
+        "SELECT datetime('now', ?)", (f'-{older_than_days} days',)
+    ).fetchone()[0]
+    archived = 0
+    try:
+        while True:
+            rows = conn.execute(
+                "SELECT id, user_id, user_message, bot_response, intent, created_at "
+                "FROM chatbot_logs WHERE created_at < ? ORDER BY id LIMIT ?",
+                (cutoff, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+
+            rows_by_day = defaultdict(list)
+            intents = Counter()
+            for r in rows:
+                day = r['created_at'][:10]
+                rows_by_day[day].append(dict(r))
+                intents[(day, r['intent'] or 'unknown')] += 1
+            _append_archive(archive_dir, rows_by_day)
+
+            # Short write transaction: the batch is exactly the matching rows
+            # with id <= last id, since it was read in id order
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO chatbot_intent_daily (day, intent, message_count) VALUES (?, ?, ?) "
+                    "ON CONFLICT (day, intent) DO UPDATE SET "
+                    "message_count = message_count + excluded.message_count",
+                    [(day, intent, n) for (day, intent), n in intents.items()]
+                )
+                conn.execute(
+                    "DELETE FROM chatbot_logs WHERE id <= ? AND created_at < ?",
+                    (rows[-1]['id'], cutoff)
+                )
+                # Renew the lease for long backlogs
+                conn.execute(
+                    "UPDATE app_state SET value = ? WHERE key = ?",
+                    (f"{owner}|{time.time() + lease_ttl}", LEASE_KEY)
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+            archived += len(rows)
+            if verbose:
+                print(f"   archived {archived} rows (through id {rows[-1]['id']})")
+            if len(rows) < batch_size:
+                break
+            # Let queued writers in between batches
+            time.sleep(pause)
+    finally:
+        _release_lease(conn, owner)
+        conn.close()
+    return archived
+
+
+def iter_archived_logs(start_day=None, end_day=None, intent=None, archive_dir=None):
+    """
+    Stream archived chatbot_logs rows (dicts) in day order, one line at a time.
+    Days are 'YYYY-MM-DD' and inclusive; rows written twice by an interrupted
+    run are yielded once.
+
+    The archiver appends each day's rows in id order, and a run that restarts
+    replays ids it already wrote. So each file is deduplicated with the few id
+    ranges it has covered so far, never a set of every id.
+    """
+    root = os.path.join(archive_dir or ARCHIVE_DIR, 'chatbot_logs')
+    if not os.path.isdir(root):
+        return
+
+    for year in sorted(os.listdir(root)):
+        for month in sorted(os.listdir(os.path.join(root, year))):
+            month_dir = os.path.join(root, year, month)
+            for name in sorted(os.listdir(month_dir)):
+                if not name.endswith('.ndjson.gz'):
+                    continue
+                day = name[:-len('.ndjson.gz')]
+                if start_day and day < start_day:
+                    continue
+                if end_day and day > end_day:
+                    continue
+
+                ranges = []     # [first id, last id] runs yielded from this file
+                with gzip.open(os.path.join(month_dir, name), 'rt', encoding='utf-8') as f:
+                    for line in f:
+                        row = json.loads(line)
+                        row_id = row['id']
+                        if any(lo <= row_id <= hi for lo, hi in ranges):
+                            continue
+                        if ranges and row_id > ranges[-1][1]:
+                            ranges[-1][1] = row_id
+                        else:
+                            ranges.append([row_id, row_id])
+                        if intent and row.get('intent') != intent:
+                            continue
+                        yield row
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='chatbot_logs retention and archive queries')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_archive = sub.add_parser('archive', help='move old rows into the archive')
+    p_archive.add_argument('--days', type=int, default=30, help='keep this many days in the DB')
+    p_archive.add_argument('--batch-size', type=int, default=500)
+    p_archive.add_argument('--archive-dir')
+
+    p_query = sub.add_parser('query', help='stream archived rows as NDJSON')
+    p_query.add_argument('--from', dest='start_day')
+    p_query.add_argument('--to', dest='end_day')
+    p_query.add_argument('--intent')
+    p_query.add_argument('--archive-dir')
+
+    args = parser.parse_args()
+    if args.command == 'archive':
+        count = archive_chatbot_logs(args.days, args.batch_size,
+                                     archive_dir=args.archive_dir, verbose=True)
+        print(f"✅ Archived {count} chatbot log rows")
+    else:
+        for row in iter_archived_logs(args.start_day, args.end_day, args.intent, args.archive_dir):
+            print(json.dumps(row, ensure_ascii=False))
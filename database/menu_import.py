@@ -0,0 +1,238 @@
+"""
+Bulk menu import / upsert from CSV or NDJSON.
+Input is parsed as a stream and handled in chunks: each chunk is diffed
+against the rows already in menu_items (matched by id, else by name,
+case-insensitively) and only new or changed items are written, with
+executemany, in one short transaction per chunk that also holds the diff, so
+concurrent imports cannot both insert the same new name. Each chunk bumps
+menu_version (app_state) and stamps its rows with it, so running processes
+can fetch just the rows that changed since the version they hold.
+"""
+import io
+import sys
+import csv
+import json
+import argparse
+
+from database.db import get_db, run_write, lock_for_write
+
+FORMATS = ('csv', 'ndjson')
+FIELDS = ('name', 'description', 'price', 'category', 'image_url', 'rating', 'is_veg', 'is_available')
+DEFAULTS = {'description': '', 'image_url': None, 'rating': 4.0, 'is_veg': 1, 'is_available': 1}
+CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 50
+
+TRUE_WORDS = {'1', 'true', 'yes', 'y', 'veg'}
+FALSE_WORDS = {'0', 'false', 'no', 'n', 'non-veg', 'nonveg'}
+
+
+def _flag(value):
+    if isinstance(value, bool):
+        return int(value)
+    word = str(value).strip().lower()
+    if word in TRUE_WORDS:
+        return 1
+    if word in FALSE_WORDS:
+        return 0
+    raise ValueError(f"not a yes/no value: {value!r}")
+
+
+def normalize(record):
+    """
+    Validate one input record. Returns a dict with the fields it provides
+    (plus id when given); blank optional fields count as not provided.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("record must be an object")
+    clean = {}
+    if record.get('id') not in (None, ''):
+        clean['id'] = int(record['id'])
+    for field in ('name', 'category'):
+        value = str(record.get(field) or '').strip()
+        if not value:
+            raise ValueError(f"missing {field}")
+        clean[field] = value
+    try:
+        clean['price'] = round(float(record.get('price')), 2)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid price: {record.get('price')!r}")
+    if clean['price'] < 0:
+        raise ValueError("price must not be negative")
+
+    for field in ('description', 'image_url'):
+        if record.get(field) not in (None, ''):
+            clean[field] = str(record[field]).strip()
+    if record.get('rating') not in (None, ''):
+        rating = float(record['rating'])
+        if not 0 <= rating <= 5:
+            raise ValueError("rating must be between 0 and 5")
+        clean['rating'] = rating
+    for field in ('is_veg', 'is_available'):
+        if record.get(field) not in (None, ''):
+            clean[field] = _flag(record[field])
+    return clean
+
+
+def iter_records(stream, fmt):
+    """(line number, raw record) pairs from a binary stream"""
+    if fmt == 'csv':
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == 'ndjson':
+        for line_no, line in enumerate(stream, 1):
+            line = line.strip()
+            if line:
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError as e:
+                    yield line_no, e
+    else:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+
+
+def current_menu_version(conn):
+    row = conn.execute("SELECT value FROM app_state WHERE key = 'menu_version'").fetchone()
+    return int(row['value']) if row else 0
+
+
+def menu_changes_since(conn, version):
+    """Rows written by imports newer than `version` (including now-unavailable ones)"""
+    rows = conn.execute(
+        "SELECT * FROM menu_items WHERE version > ? ORDER BY id", (version,)
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _diff_chunk(conn, chunk):
+    """Split a chunk into (inserts, updates, unchanged count) against the DB"""
+    # Later lines win within a chunk
+    by_key = {}
+    for record in chunk:
+        by_key[record.get('id') or record['name'].lower()] = record
+
+    ids = [k for k in by_key if isinstance(k, int)]
+    names = list({r['name'].lower() for r in by_key.values()})
+    existing_by_id, existing_by_name = {}, {}
+    if ids:
+        for row in conn.execute(
+            f"SELECT * FROM menu_items WHERE id IN ({','.join('?' * len(ids))})", ids
+        ):
+            existing_by_id[row['id']] = row
+    for row in conn.execute(
+        f"SELECT * FROM menu_items WHERE name COLLATE NOCASE IN ({','.join('?' * len(names))}) ORDER BY id",
+        names
+    ):
+        existing_by_name.setdefault(row['name'].lower(), row)
+
+    inserts, updates, unchanged = [], [], 0
+    for record in by_key.values():
+        row = existing_by_id.get(record.get('id')) or existing_by_name.get(record['name'].lower())
+        if row is None:
+            inserts.append({**DEFAULTS, **{k: v for k, v in record.items() if k != 'id'}})
+            continue
+        merged = {field: record.get(field, row[field]) for field in FIELDS}
+        if all(merged[field] == row[field] for field in FIELDS):
+            unchanged += 1
+        else:
+            merged['id'] = row['id']
+            updates.append(merged)
+    return inserts, updates, unchanged
+
+
+def import_menu(records, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    Upsert an iterable of (line number, raw record) pairs.
+    Returns a summary with inserted / updated / unchanged / rejected counts and
+    the menu_version of the last chunk written (each chunk gets its own).
+    """
+    summary = {'received': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0,
+               'rejected': 0, 'errors': [], 'menu_version': None, 'dry_run': dry_run}
+
+    def diff(conn, chunk):
+        inserts, updates, unchanged = _diff_chunk(conn, chunk)
+        summary['inserted'] += len(inserts)
+        summary['updated'] += len(updates)
+        summary['unchanged'] += unchanged
+        return inserts, updates
+
+    def flush(chunk):
+        if dry_run:
+            conn = get_db()
+            try:
+                diff(conn, chunk)
+            finally:
+                conn.close()
+            return
+
+        def write(conn):
+            # Diff under the write lock: a concurrent import cannot insert
+            # the same new name between our read and our insert
+            lock_for_write(conn)
+            inserts, updates = diff(conn, chunk)
+            if not (inserts or updates):
+                return
+            # Each chunk publishes its own version in the same transaction as
+            # its rows, so a sync between chunks never skips later ones
+            version = current_menu_version(conn) + 1
+            conn.executemany(
+                f"INSERT INTO menu_items ({', '.join(FIELDS)}, version) "
+                f"VALUES ({', '.join('?' * len(FIELDS))}, ?)",
+                [tuple(r[f] for f in FIELDS) + (version,) for r in inserts]
+            )
+            conn.executemany(
+                f"UPDATE menu_items SET {', '.join(f + ' = ?' for f in FIELDS)}, version = ? WHERE id = ?",
+                [tuple(r[f] for f in FIELDS) + (version, r['id']) for r in updates]
+            )
+            conn.execute(
+                "INSERT INTO app_state (key, value) VALUES ('menu_version', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (str(version),)
+            )
+            summary['menu_version'] = version
+
+        run_write(write)
+
+    chunk = []
+    for line_no, record in records:
+        summary['received'] += 1
+        try:
+            if isinstance(record, Exception):
+                raise record
+            chunk.append(normalize(record))
+        except (ValueError, TypeError) as e:
+            summary['rejected'] += 1
+            if len(summary['errors']) < MAX_REPORTED_ERRORS:
+                summary['errors'].append({'line': line_no, 'error': str(e)})
+            continue
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk upsert menu items from CSV or NDJSON')
+    parser.add_argument('path', help="input file, or - for stdin")
+    parser.add_argument('--format', choices=FORMATS,
+                        help='default: from the file extension (.csv, else ndjson)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--dry-run', action='store_true', help='report the diff without writing')
+    args = parser.parse_args()
+
+    fmt = args.format or ('csv' if args.path.lower().endswith('.csv') else 'ndjson')
+    stream = sys.stdin.buffer if args.path == '-' else open(args.path, 'rb')
+    try:
+        result = import_menu(iter_records(stream, fmt), args.chunk_size, args.dry_run)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    for error in result['errors']:
+        print(f"   line {error['line']}: {error['error']}")
+    print(f"✅ Menu import{' (dry run)' if args.dry_run else ''}: "
+          f"{result['inserted']} inserted, {result['updated']} updated, "
+          f"{result['unchanged']} unchanged, {result['rejected']} rejected "
+          f"(menu version {result['menu_version']})")
@@ -0,0 +1,135 @@
+"""
+Order persistence on top of the shard router in database.db.
+Unsharded, every call here is plain SQL against restaurant.db. With
+ORDER_SHARDS > 1 an order and its items, status events and rollup rows are
+written to one shard, and history reads scatter over the shards and merge.
+"""
+import heapq
+
+from database.db import (
+    get_db, get_order_db, run_write, is_sharded, order_shards,
+    shard_of_order, choose_order_shard, ORDER_SHARDS
+)
+from database import rollups
+from backend.order_status import record_status
+
+
+def validate_items(items):
+    """Price cart items against the catalog: (total, validated_items)"""
+    ids = [int(cart_item['id']) for cart_item in items]
+    conn = get_db()
+    try:
+        placeholders = ','.join('?' * len(ids))
+        menu = {
+            row['id']: row for row in conn.execute(
+                f"SELECT id, name, price FROM menu_items WHERE id IN ({placeholders})", ids
+            )
+        }
+    finally:
+        conn.close()
+
+    total = 0
+    validated_items = []
+    for cart_item in items:
+        item = menu.get(int(cart_item['id']))
+        if item:
+            subtotal = item['price'] * cart_item['quantity']
+            total += subtotal
+            validated_items.append({
+                'menu_item_id': item['id'],
+                'quantity': cart_item['quantity'],
+                'item_price': item['price'],
+                'name': item['name']
+            })
+    return total, validated_items
+
+
+# Millisecond resolution: created_at has whole seconds, and sharded ids say
+# nothing about the order in which different shards took their orders
+PLACED_AT_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+def _insert_order(conn, shard, total, order_type, delivery_address):
+    if not is_sharded():
+        cursor = conn.execute(
+            "INSERT INTO orders (user_id, total_amount, status, order_type, delivery_address, placed_at) "
+            f"VALUES (?, ?, ?, ?, ?, {PLACED_AT_NOW})",
+            (1, total, 'confirmed', order_type, delivery_address)
+        )
+        return cursor.lastrowid
+    # Globally unique ids: shard s only hands out ids with id % N == s.
+    # One statement, so the id is read under the write lock
+    cursor = conn.execute(
+        "INSERT INTO orders (id, user_id, total_amount, status, order_type, delivery_address, placed_at) "
+        f"SELECT COALESCE(MAX(id), ?) + ?, ?, ?, ?, ?, ?, {PLACED_AT_NOW} FROM orders",
+        (shard, ORDER_SHARDS, 1, total, 'confirmed', order_type, delivery_address)
+    )
+    return cursor.lastrowid
+
+
+def place_order(items, order_type='manual', delivery_address='', shard_key=None):
+    """
+    Price the cart against the catalog, then write the order to its shard in
+    one transaction. Returns (order_id, total, validated_items).
+    """
+    # Catalog reads stay outside the shard's write transaction
+    total, validated_items = validate_items(items)
+    shard = choose_order_shard(shard_key)
+
+    def write(conn):
+        order_id = _insert_order(conn, shard, total, order_type, delivery_address)
+        conn.executemany(
+            "INSERT INTO order_items (order_id, menu_item_id, quantity, item_price) VALUES (?, ?, ?, ?)",
+            [(order_id, vi['menu_item_id'], vi['quantity'], vi['item_price']) for vi in validated_items]
+        )
+        record_status(conn, order_id, 'confirmed')
+        rollups.apply_order(conn, order_id, order_type, total, validated_items)
+        return order_id
+
+    order_id = run_write(write, shard)
+    return order_id, total, validated_items
+
+
+def _menu_table():
+    # Shard connections see the catalog as an attached database
+    return 'catalog.menu_items' if is_sharded() else 'menu_items'
+
+
+def recent_orders(limit=3):
+    """Latest orders with their items, merged across shards"""
+    per_shard = []
+    for shard in order_shards():
+        conn = get_order_db(shard)
+        try:
+            orders = conn.execute(
+                "SELECT * FROM orders ORDER BY placed_at DESC, id DESC LIMIT ?", (limit,)
+            ).fetchall()
+            result = []
+            for order in orders:
+                order_dict = dict(order)
+                # Get order items with menu item details
+                items = conn.execute(f'''
+                    SELECT oi.*, mi.name, mi.image_url, mi.is_veg
+                    FROM order_items oi
+                    JOIN {_menu_table()} mi ON oi.menu_item_id = mi.id
+                    WHERE oi.order_id = ?
+                ''', (order['id'],)).fetchall()
+                order_dict['items'] = [dict(i) for i in items]
+                result.append(order_dict)
+            per_shard.append(result)
+        finally:
+            conn.close()
+
+    # Each shard's list is already newest first
+    merged = heapq.merge(*per_shard, key=lambda o: (o['placed_at'], o['id']), reverse=True)
+    return list(merged)[:limit]
+
+
+def load_order_status(order_id):
+    """{'id', 'status'} of one order, or None"""
+    conn = get_order_db(shard_of_order(order_id), attach_catalog=False)
+    try:
+        row = conn.execute("SELECT id, status FROM orders WHERE id = ?", (order_id,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
@@ -0,0 +1,226 @@
+"""
+Incrementally maintained sales rollups.
+sales_daily and item_sales_daily are updated inside the order transaction, so
+dashboard reads touch only (days x order types) or (days x menu items) rows,
+never the full orders / order_items history.
+With sharded order storage each shard keeps rollups for its own orders and
+reads sum across shards.
+"""
+import argparse
+from collections import defaultdict
+
+from database.db import get_db, get_order_db, order_shards
+
+UPSERT_SALES = '''
+    INSERT INTO sales_daily (day, order_type, order_count, revenue)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (day, order_type) DO UPDATE SET
+        order_count = order_count + excluded.order_count,
+        revenue = revenue + excluded.revenue
+'''
+
+UPSERT_ITEM_SALES = '''
+    INSERT INTO item_sales_daily (day, menu_item_id, quantity, revenue)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (day, menu_item_id) DO UPDATE SET
+        quantity = quantity + excluded.quantity,
+        revenue = revenue + excluded.revenue
+'''
+
+
+def apply_order(conn, order_id, order_type, total, items):
+    """
+    Add one order to the rollups (caller commits, in the same transaction
+    that inserted the order). items: dicts with menu_item_id, quantity, item_price.
+    """
+    day = conn.execute(
+        "SELECT date(created_at) FROM orders WHERE id = ?", (order_id,)
+    ).fetchone()[0]
+    conn.execute(UPSERT_SALES, (day, order_type, 1, total))
+
+    per_item = defaultdict(lambda: [0, 0.0])
+    for item in items:
+        agg = per_item[item['menu_item_id']]
+        agg[0] += item['quantity']
+        agg[1] += item['quantity'] * item['item_price']
+    conn.executemany(
+        UPSERT_ITEM_SALES,
+        [(day, item_id, qty, revenue) for item_id, (qty, revenue) in per_item.items()]
+    )
+
+
+def _get_state(conn, key, default=0):
+    row = conn.execute("SELECT value FROM app_state WHERE key = ?", (key,)).fetchone()
+    return int(row['value']) if row else default
+
+
+def _set_state(conn, key, value):
+    conn.execute(
+        "INSERT INTO app_state (key, value) VALUES (?, ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (key, str(value))
+    )
+
+
+def backfill_all(chunk_size=1000, verbose=False):
+    """Run the backfill on every order shard"""
+    done = 0
+    for shard in order_shards():
+        conn = get_order_db(shard, attach_catalog=False)
+        try:
+            done += backfill(chunk_size, conn, verbose)
+        finally:
+            conn.close()
+    return done
+
+
+def backfill(chunk_size=1000, conn=None, verbose=False):
+    """
+    One-time job: fold orders that predate the rollups into them.
+    Streams history in id-ordered chunks, committing each chunk together with
+    its progress marker, so it is resumable and never double counts.
+    Returns the number of orders folded in.
+    """
+    own_conn = conn is None
+    conn = conn or get_db()
+    done = 0
+    try:
+        live_from = _get_state(conn, 'rollups_live_from_order_id')
+        while True:
+            progress = _get_state(conn, 'rollups_backfilled_through')
+            orders = conn.execute(
+                "SELECT id, order_type, total_amount, date(created_at) AS day FROM orders "
+                "WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+                (progress, live_from, chunk_size)
+            ).fetchall()
+            if not orders:
+                break
+
+            first_id, last_id = orders[0]['id'], orders[-1]['id']
+            sales = defaultdict(lambda: [0, 0.0])
+            day_of = {}
+            for o in orders:
+                agg = sales[(o['day'], o['order_type'])]
+                agg[0] += 1
+                agg[1] += o['total_amount']
+                day_of[o['id']] = o['day']
+
+            item_sales = defaultdict(lambda: [0, 0.0])
+            cursor = conn.execute(
+                "SELECT order_id, menu_item_id, quantity, item_price FROM order_items "
+                "WHERE order_id BETWEEN ? AND ?",
+                (first_id, last_id)
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for r in rows:
+                    agg = item_sales[(day_of[r['order_id']], r['menu_item_id'])]
+                    agg[0] += r['quantity']
+                    agg[1] += r['quantity'] * r['item_price']
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another backfill may have folded this chunk in since we read
+                # progress: check again under the write lock, and redo the read
+                if _get_state(conn, 'rollups_backfilled_through') != progress:
+                    conn.rollback()
+                    continue
+                conn.executemany(UPSERT_SALES, [
+                    (day, order_type, count, revenue)
+                    for (day, order_type), (count, revenue) in sales.items()
+                ])
+                conn.executemany(UPSERT_ITEM_SALES, [
+                    (day, item_id, qty, revenue)
+                    for (day, item_id), (qty, revenue) in item_sales.items()
+                ])
+                _set_state(conn, 'rollups_backfilled_through', last_id)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+            done += len(orders)
+            if verbose:
+                print(f"   backfilled orders {first_id}..{last_id} ({done} total)")
+    finally:
+        if own_conn:
+            conn.close()
+    return done
+
+
+def daily_sales(days=30):
+    """Revenue and order count per day and order_type for the last `days` days"""
+    totals = defaultdict(lambda: [0, 0.0])
+    for shard in order_shards():
+        conn = get_order_db(shard, attach_catalog=False)
+        try:
+            rows = conn.execute(
+                "SELECT day, order_type, order_count, revenue FROM sales_daily "
+                "WHERE day >= date('now', ?)",
+                (f'-{days - 1} days',)
+            ).fetchall()
+        finally:
+            conn.close()
+        for r in rows:
+            agg = totals[(r['day'], r['order_type'])]
+            agg[0] += r['order_count']
+            agg[1] += r['revenue']
+    return [
+        {'day': day, 'order_type': order_type, 'order_count': count, 'revenue': revenue}
+        for (day, order_type), (count, revenue) in sorted(totals.items())
+    ]
+
+
+def top_items(days=7, limit=5):
+    """Best selling items by quantity over the last `days` days"""
+    totals = defaultdict(lambda: [0, 0.0])
+    for shard in order_shards():
+        conn = get_order_db(shard, attach_catalog=False)
+        try:
+            rows = conn.execute(
+                "SELECT menu_item_id, SUM(quantity) AS quantity, SUM(revenue) AS revenue "
+                "FROM item_sales_daily WHERE day >= date('now', ?) GROUP BY menu_item_id",
+                (f'-{days - 1} days',)
+            ).fetchall()
+        finally:
+            conn.close()
+        for r in rows:
+            agg = totals[r['menu_item_id']]
+            agg[0] += r['quantity']
+            agg[1] += r['revenue']
+
+    ranked = sorted(totals.items(), key=lambda kv: (-kv[1][0], -kv[1][1]))[:limit]
+    if not ranked:
+        return []
+    ids = [item_id for item_id, _ in ranked]
+    conn = get_db()
+    try:
+        names = {
+            r['id']: r for r in conn.execute(
+                f"SELECT id, name, category FROM menu_items WHERE id IN ({','.join('?' * len(ids))})", ids
+            )
+        }
+    finally:
+        conn.close()
+    return [
+        {
+            'menu_item_id': item_id,
+            'name': names[item_id]['name'] if item_id in names else None,
+            'category': names[item_id]['category'] if item_id in names else None,
+            'quantity': qty,
+            'revenue': round(revenue, 2)
+        }
+        for item_id, (qty, revenue) in ranked
+    ]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sales rollup maintenance')
+    parser.add_argument('command', choices=['backfill'])
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    count = backfill_all(chunk_size=args.chunk_size, verbose=True)
+    print(f"✅ Rollup backfill complete: {count} orders")
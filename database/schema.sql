@@ -24,9 +24,13 @@ CREATE TABLE IF NOT EXISTS menu_items (
     rating DECIMAL(2, 1) DEFAULT 4.0,
     is_veg BOOLEAN DEFAULT TRUE,
     is_available BOOLEAN DEFAULT TRUE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    version INT NOT NULL DEFAULT 0
 );
 
+CREATE INDEX idx_menu_items_name ON menu_items(name);
+CREATE INDEX idx_menu_items_version ON menu_items(version);
+
 -- Orders table
 CREATE TABLE IF NOT EXISTS orders (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -36,6 +40,7 @@ CREATE TABLE IF NOT EXISTS orders (
     order_type VARCHAR(20) DEFAULT 'manual',
     delivery_address TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    placed_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP(3),
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
@@ -61,6 +66,54 @@ CREATE TABLE IF NOT EXISTS chatbot_logs (
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
+-- Order Status Events table (confirmed -> preparing -> out_for_delivery -> delivered)
+CREATE TABLE IF NOT EXISTS order_status_events (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    order_id INT NOT NULL,
+    status VARCHAR(30) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_orders_status_created ON orders(status, created_at);
+CREATE INDEX idx_orders_placed ON orders(placed_at, id);
+CREATE INDEX idx_order_items_order ON order_items(order_id);
+CREATE INDEX idx_order_status_events_order ON order_status_events(order_id, id);
+
+-- App State table (watermarks and versions)
+CREATE TABLE IF NOT EXISTS app_state (
+    `key` VARCHAR(100) PRIMARY KEY,
+    value TEXT
+);
+
+-- Daily sales rollup by order type
+CREATE TABLE IF NOT EXISTS sales_daily (
+    day DATE NOT NULL,
+    order_type VARCHAR(20) NOT NULL,
+    order_count INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, order_type)
+);
+
+-- Daily per-item sales rollup
+CREATE TABLE IF NOT EXISTS item_sales_daily (
+    day DATE NOT NULL,
+    menu_item_id INT NOT NULL,
+    quantity INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, menu_item_id)
+);
+
+-- Daily chatbot intent counts (kept after chatbot_logs rows are archived)
+CREATE TABLE IF NOT EXISTS chatbot_intent_daily (
+    day DATE NOT NULL,
+    intent VARCHAR(50) NOT NULL,
+    message_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, intent)
+);
+
+CREATE INDEX idx_chatbot_logs_created ON chatbot_logs(created_at);
+
 -- Seed default user
 INSERT INTO users (name, email, phone) VALUES ('Guest User', 'guest@restaurant.com', '0000000000');
 
@@ -86,3 +139,6 @@ INSERT INTO menu_items (name, description, price, category, image_url, rating, i
 ('Pasta Alfredo', 'Creamy white sauce pasta with herbs & mushrooms', 229.00, 'Main Course', 'https://images.unsplash.com/photo-1645112411341-6c4fd023714a?w=400', 4.3, TRUE),
 ('Naan Bread', 'Soft tandoori naan with butter', 49.00, 'Sides', 'https://images.unsplash.com/photo-1565557623262-b51c2513a641?w=400', 4.1, TRUE),
 ('Mango Lassi', 'Thick & creamy mango yogurt drink', 79.00, 'Beverages', 'https://images.unsplash.com/photo-1527685609591-44b0aef2400b?w=400', 4.4, TRUE);
+
+-- Menu version bumped by every bulk menu import
+INSERT INTO app_state (`key`, value) VALUES ('menu_version', '0');
@@ -7,9 +7,22 @@ const api = axios.create({
   headers: { 'Content-Type': 'application/json' }
 });
 
+// Thumbnail URLs come back root-relative unless the API has PUBLIC_BASE_URL set
+const API_ORIGIN = new URL(API_BASE).origin;
+const withApiOrigin = (url) => (url && url.startsWith('/') ? `${API_ORIGIN}${url}` : url);
+
 // Menu APIs
 export const getMenu = (category) =>
-  api.get('/menu', { params: category ? { category } : {} });
+  api.get('/menu', { params: category ? { category } : {} }).then((res) => {
+    if (res.data.success) {
+      res.data.data = res.data.data.map((item) => ({
+        ...item,
+        image_url: withApiOrigin(item.image_url),
+        image_srcset: item.image_srcset && item.image_srcset.split(', ').map(withApiOrigin).join(', ')
+      }));
+    }
+    return res;
+  });
 
 export const getCategories = () =>
   api.get('/menu/categories');
@@ -28,6 +41,17 @@ export const createOrder = (items, order_type = 'manual', delivery_address = '')
 export const getRecentOrders = () =>
   api.get('/orders/recent');
 
+// Live order status via Server-Sent Events; returns an unsubscribe function
+export const subscribeOrderStatus = (orderId, onStatus) => {
+  const source = new EventSource(`${API_BASE}/orders/${orderId}/events`);
+  source.addEventListener('status', (e) => {
+    const event = JSON.parse(e.data);
+    onStatus(event.status);
+    if (event.status === 'delivered' || event.status === 'cancelled') source.close();
+  });
+  return () => source.close();
+};
+
 // Chatbot API
 export const sendChatMessage = (message) =>
   api.post('/chatbot', { message });
@@ -24,6 +24,8 @@ const MenuCard = ({ item }) => {
       <div className="relative h-48 overflow-hidden">
         <img
           src={item.image_url}
+          srcSet={item.image_srcset}
+          sizes="(max-width: 640px) 100vw, 320px"
           alt={item.name}
           className="w-full h-full object-cover transition-transform duration-500 hover:scale-110"
           loading="lazy"
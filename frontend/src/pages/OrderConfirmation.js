@@ -3,16 +3,27 @@ import { motion } from 'framer-motion';
 import { Link } from 'react-router-dom';
 import { FiCheck, FiClock, FiPackage } from 'react-icons/fi';
 import { AppContext } from '../App';
+import { subscribeOrderStatus } from '../api';
+
+const STATUS_FLOW = ['confirmed', 'preparing', 'out_for_delivery', 'delivered'];
 
 const OrderConfirmation = () => {
   const { lastOrder, darkMode } = useContext(AppContext);
   const [showConfetti, setShowConfetti] = useState(true);
+  const [status, setStatus] = useState(lastOrder?.status);
 
   useEffect(() => {
     const timer = setTimeout(() => setShowConfetti(false), 4000);
     return () => clearTimeout(timer);
   }, []);
 
+  useEffect(() => {
+    if (!lastOrder?.order_id) return undefined;
+    return subscribeOrderStatus(lastOrder.order_id, setStatus);
+  }, [lastOrder?.order_id]);
+
+  const stage = Math.max(STATUS_FLOW.indexOf(status), 0);
+
   if (!lastOrder) {
     return (
       <motion.div initial={{ opacity: 0 }} animate={{ opacity: 1 }} className="max-w-2xl mx-auto px-4 py-20 text-center">
@@ -106,17 +117,17 @@ const OrderConfirmation = () => {
         <div className="flex items-center justify-between mb-4">
           <h3 className="font-bold text-lg">Order #{lastOrder.order_id}</h3>
           <span className="px-3 py-1 bg-green-100 dark:bg-green-900/30 text-green-600 rounded-full text-sm font-medium">
-            {lastOrder.status}
+            {status?.replace(/_/g, ' ')}
           </span>
         </div>
 
         {/* Timeline */}
         <div className="flex items-center gap-4 mb-6 py-4">
           {[
-            { icon: <FiCheck />, label: 'Confirmed', active: true },
-            { icon: <FiPackage />, label: 'Preparing', active: true },
-            { icon: <FiClock />, label: 'On the way', active: false },
-            { icon: <FiCheck />, label: 'Delivered', active: false }
+            { icon: <FiCheck />, label: 'Confirmed', active: stage >= 0 },
+            { icon: <FiPackage />, label: 'Preparing', active: stage >= 1 },
+            { icon: <FiClock />, label: 'On the way', active: stage >= 2 },
+            { icon: <FiCheck />, label: 'Delivered', active: stage >= 3 }
           ].map((step, i) => (
             <React.Fragment key={step.label}>
               <div className="flex flex-col items-center">
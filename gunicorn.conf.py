@@ -0,0 +1,21 @@
+"""
+Gunicorn settings for the FoodieHub API.
+Use with the app factory so setup and warm-up run once in the master:
+    gunicorn -c gunicorn.conf.py 'backend.app:create_app()'
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+preload_app = True
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+# Open order status streams hold a thread each (up to SSE_MAX_STREAM_SECONDS)
+threads = int(os.getenv('GUNICORN_THREADS', '32'))
+
+
+def when_ready(server):
+    # Everything the master built so far (menu snapshot, chatbot indexes) is
+    # moved out of the collector's reach, so workers touching those objects do
+    # not dirty and copy the shared pages through refcount/GC bookkeeping
+    gc.freeze()